@@ -51,6 +51,7 @@ resource "aws_iam_role_policy" "lambda_monitoring_policy" {
         Action = [
           "dynamodb:PutItem",
           "dynamodb:GetItem",
+          "dynamodb:BatchGetItem",
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
           "dynamodb:Query",
@@ -106,6 +107,21 @@ resource "aws_iam_role_policy" "lambda_monitoring_policy" {
           }
         }
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "cloudwatch:GetMetricData"
+        ]
+        Resource = "*"
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "lambda:ListFunctions",
+          "lambda:GetFunctionConfiguration"
+        ]
+        Resource = "*"
+      },
       {
         Effect = "Allow"
         Action = [
@@ -406,6 +422,7 @@ resource "aws_iam_role_policy" "cost_optimizer_policy" {
         Effect = "Allow"
         Action = [
           "ce:GetCostAndUsage",
+          "ce:GetAnomalies",
           "ce:GetUsageReport",
           "ce:GetReservationCoverage",
           "ce:GetReservationPurchaseRecommendation",
@@ -434,6 +451,40 @@ resource "aws_iam_role_policy" "cost_optimizer_policy" {
         ]
         Resource = "*"
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "cloudwatch:GetMetricData"
+        ]
+        Resource = "*"
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:GetObject",
+          "s3:PutObject"
+        ]
+        Resource = [
+          "${aws_s3_bucket.monitoring_data.arn}/cost-analysis/*",
+          "${aws_s3_bucket.monitoring_data.arn}/ce-cache/*"
+        ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:ListBucket"
+        ]
+        # Unconditioned so GetObject on a missing cache key returns NoSuchKey rather than AccessDenied
+        Resource = aws_s3_bucket.monitoring_data.arn
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "kms:Decrypt",
+          "kms:GenerateDataKey*"
+        ]
+        Resource = aws_kms_key.monitoring_encryption.arn
+      },
       {
         Effect = "Allow"
         Action = [
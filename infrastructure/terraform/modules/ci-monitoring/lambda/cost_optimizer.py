@@ -4,27 +4,39 @@ Tracks resource usage, identifies cost optimization opportunities, and implement
 """
 
 import json
+import gzip
 import boto3
 import os
+import re
 import logging
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional, Tuple
 from botocore.exceptions import ClientError
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 import statistics
 
 # Configure logging
 logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
 logger = logging.getLogger(__name__)
 
-# AWS clients
-ce = boto3.client('ce')  # Cost Explorer
-cloudwatch = boto3.client('cloudwatch')
-lambda_client = boto3.client('lambda')
-ec2 = boto3.client('ec2')
-s3 = boto3.client('s3')
-sns = boto3.client('sns')
-application_autoscaling = boto3.client('application-autoscaling')
+# AWS clients are created lazily from one shared session and reused across warm invocations
+_session = boto3.session.Session()
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(service_name: str):
+    """Get a cached boto3 client, creating it on first use"""
+    client = _clients.get(service_name)
+    if client is None:
+        # Client creation is not thread-safe, unlike calls on an existing client
+        with _clients_lock:
+            client = _clients.get(service_name)
+            if client is None:
+                client = _session.client(service_name)
+                _clients[service_name] = client
+    return client
 
 # Configuration
 S3_BUCKET = os.getenv('S3_BUCKET')
@@ -32,8 +44,102 @@ SNS_COST_TOPIC = os.getenv('SNS_COST_TOPIC')
 COST_THRESHOLD_USD = float(os.getenv('COST_THRESHOLD_USD', '100'))
 AUTO_SCALING_ENABLED = os.getenv('AUTO_SCALING_ENABLED', 'true').lower() == 'true'
 SCALING_TARGET_UTIL = float(os.getenv('SCALING_TARGET_UTIL', '70'))
+# Cost Explorer refreshes up to three times daily; cached responses younger than this are reused
+CACHE_MAX_AGE_HOURS = float(os.getenv('CACHE_MAX_AGE_HOURS', '8'))
+# Cost trend source: 'period' compares against the previous half-window, 'anomalies' uses Cost Anomaly
+# Detection and needs an anomaly monitor, which this module does not create
+COST_TREND_SOURCE = os.getenv('COST_TREND_SOURCE', 'period').lower()
+# Worker threads for concurrent per-function AWS calls (I/O bound)
+MAX_WORKERS = int(os.getenv('MAX_WORKERS', '16'))
+# Cost Explorer group count above which per-service sums are vectorized with numpy
+VECTORIZE_MIN_GROUPS = int(os.getenv('VECTORIZE_MIN_GROUPS', '1000'))
+
+# Lambda functions whose names match are treated as CI/CD monitoring functions
+CI_FUNCTION_PATTERN = re.compile(r'ci|cd|pipeline|monitor', re.IGNORECASE)
+
+def load_cached_response(key: str, now: datetime) -> Optional[Dict[str, Any]]:
+    """Load a cached API response from S3 if it is still fresh as of now"""
+    if not S3_BUCKET:
+        return None
+
+    try:
+        response = get_client('s3').get_object(Bucket=S3_BUCKET, Key=key)
+
+        age = now - response['LastModified']
+        if age > timedelta(hours=CACHE_MAX_AGE_HOURS):
+            return None
+
+        return json.loads(response['Body'].read())
+
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'NoSuchKey':
+            logger.warning(f"Error reading cached response {key}: {str(e)}")
+        return None
+    except (json.JSONDecodeError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cached response {key}: {str(e)}")
+        return None
+
+def store_cached_response(key: str, data: Dict[str, Any], now: datetime):
+    """Store an API response in S3 for reuse by later invocations"""
+    if not S3_BUCKET:
+        return
+
+    try:
+        get_client('s3').put_object(
+            Bucket=S3_BUCKET,
+            Key=key,
+            Body=json.dumps(data, default=str),
+            ContentType='application/json',
+            Metadata={'fetched': now.isoformat()},
+            ServerSideEncryption='aws:kms'
+        )
+    except ClientError as e:
+        logger.warning(f"Error caching response {key}: {str(e)}")
+
+# Service-specific recommendations
+LAMBDA_RECOMMENDATIONS = (
+    "Consider optimizing Lambda memory allocation based on actual usage",
+    "Review Lambda timeout settings to prevent unnecessary charges",
+    "Implement caching to reduce Lambda invocation frequency",
+    "Consider using Provisioned Concurrency only during peak hours"
+)
+EC2_RECOMMENDATIONS = (
+    "Consider using Spot Instances for CI/CD workloads",
+    "Implement auto-shutdown for development environments",
+    "Right-size instances based on actual CPU/memory usage",
+    "Consider Reserved Instances for predictable workloads"
+)
+CLOUDWATCH_RECOMMENDATIONS = (
+    "Review log retention policies - reduce retention for debug logs",
+    "Consider sampling metrics for high-volume applications",
+    "Use CloudWatch Insights queries efficiently",
+    "Archive old logs to S3 for long-term storage"
+)
+S3_RECOMMENDATIONS = (
+    "Implement S3 lifecycle policies to transition to cheaper storage classes",
+    "Clean up incomplete multipart uploads",
+    "Use S3 Intelligent Tiering for unpredictable access patterns",
+    "Compress artifacts before storing in S3"
+)
+DYNAMODB_RECOMMENDATIONS = (
+    "Consider on-demand billing for unpredictable workloads",
+    "Optimize table design to reduce read/write operations",
+    "Use DynamoDB auto scaling for consistent workloads",
+    "Archive old data to S3 for cost savings"
+)
 
-@dataclass
+# Cost Explorer service name -> (savings rate, recommendation threshold in USD, recommendations)
+SERVICE_PROFILES = {
+    'AWS Lambda': (0.15, 50, LAMBDA_RECOMMENDATIONS),  # memory optimization and caching
+    'Amazon Elastic Compute Cloud - Compute': (0.30, 100, EC2_RECOMMENDATIONS),  # spot instances and right-sizing
+    'Amazon CloudWatch': (0.25, 20, CLOUDWATCH_RECOMMENDATIONS),  # log retention and sampling
+    'Amazon Simple Storage Service': (0.20, 30, S3_RECOMMENDATIONS),  # lifecycle policies
+    'Amazon DynamoDB': (0.15, 25, DYNAMODB_RECOMMENDATIONS),  # capacity optimization
+    'AWS CodeBuild': (0.10, float('inf'), ())  # build optimization
+}
+DEFAULT_SERVICE_PROFILE = (0.10, float('inf'), ())
+
+@dataclass(slots=True, frozen=True)
 class CostAnalysis:
     """Cost analysis result"""
     service: str
@@ -43,7 +149,7 @@ class CostAnalysis:
     optimization_potential: float
     recommendations: List[str]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResourceUtilization:
     """Resource utilization metrics"""
     resource_type: str
@@ -67,62 +173,157 @@ class CostAnalyzer:
             'GitHub Actions'  # Third-party service tracking
         ]
         
-    def get_cost_and_usage(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+    def get_cost_and_usage(self, start_date: datetime, end_date: datetime, now: datetime) -> Dict[str, Any]:
         """Get cost and usage data from AWS Cost Explorer"""
+        cache_key = f"ce-cache/{start_date.strftime('%Y-%m-%d')}_{end_date.strftime('%Y-%m-%d')}_DAILY.json"
+        cached = load_cached_response(cache_key, now)
+        if cached is not None:
+            logger.info(f"Using cached Cost Explorer data: s3://{S3_BUCKET}/{cache_key}")
+            return cached
+
+        request = {
+            'TimePeriod': {
+                'Start': start_date.strftime('%Y-%m-%d'),
+                'End': end_date.strftime('%Y-%m-%d')
+            },
+            'Granularity': 'DAILY',
+            'Metrics': ['BlendedCost', 'UsageQuantity'],
+            # Only return the services we analyze; GitHub Actions is not billed through AWS
+            'Filter': {
+                'Dimensions': {
+                    'Key': 'SERVICE',
+                    'Values': [s for s in self.services_to_analyze if s != 'GitHub Actions']
+                }
+            },
+            'GroupBy': [
+                {
+                    'Type': 'DIMENSION',
+                    'Key': 'SERVICE'
+                }
+            ]
+        }
+        results_by_time = []
+
         try:
-            response = ce.get_cost_and_usage(
-                TimePeriod={
-                    'Start': start_date.strftime('%Y-%m-%d'),
-                    'End': end_date.strftime('%Y-%m-%d')
-                },
-                Granularity='DAILY',
-                Metrics=['BlendedCost', 'UsageQuantity'],
-                GroupBy=[
-                    {
-                        'Type': 'DIMENSION',
-                        'Key': 'SERVICE'
-                    }
-                ]
-            )
-            
-            return response
+            # Grouped results are truncated per page; follow NextPageToken so large windows are complete
+            while True:
+                response = get_client('ce').get_cost_and_usage(**request)
+                results_by_time.extend(response.get('ResultsByTime', []))
+
+                next_token = response.get('NextPageToken')
+                if not next_token:
+                    break
+                request['NextPageToken'] = next_token
+
+            cost_data = {'ResultsByTime': results_by_time}
+            store_cached_response(cache_key, cost_data, now)
+
+            return cost_data
             
         except ClientError as e:
             logger.error(f"Error getting cost and usage data: {str(e)}")
             return {}
     
-    def analyze_service_costs(self, days_back: int = 30) -> List[CostAnalysis]:
-        """Analyze costs by service and identify trends"""
-        end_date = datetime.now().date()
+    def get_anomaly_impacts(self, start_date: datetime, end_date: datetime, now: datetime) -> Optional[Dict[str, float]]:
+        """Get anomalous spend per service from AWS Cost Anomaly Detection, or None if it is unavailable"""
+        cache_key = f"ce-cache/anomalies_{start_date.strftime('%Y-%m-%d')}_{end_date.strftime('%Y-%m-%d')}.json"
+        cached = load_cached_response(cache_key, now)
+        if cached is not None:
+            logger.info(f"Using cached Cost Anomaly Detection data: s3://{S3_BUCKET}/{cache_key}")
+            return cached
+
+        impacts = {}
+        request = {
+            'DateInterval': {
+                'StartDate': start_date.strftime('%Y-%m-%d'),
+                'EndDate': end_date.strftime('%Y-%m-%d')
+            }
+        }
+        
+        try:
+            while True:
+                response = get_client('ce').get_anomalies(**request)
+                
+                for anomaly in response.get('Anomalies', []):
+                    impact = anomaly.get('Impact', {}).get('TotalImpact', 0.0)
+                    services = {
+                        root_cause['Service'] for root_cause in anomaly.get('RootCauses', [])
+                        if root_cause.get('Service')
+                    }
+                    
+                    # Split the impact evenly when an anomaly has several root-cause services
+                    for service in services:
+                        impacts[service] = impacts.get(service, 0.0) + impact / len(services)
+                
+                next_token = response.get('NextPageToken')
+                if not next_token:
+                    break
+                request['NextPageToken'] = next_token
+
+            store_cached_response(cache_key, impacts, now)
+        
+            return impacts
+        
+        except ClientError as e:
+            logger.error(f"Error getting cost anomalies: {str(e)}")
+            return None
+    
+    def analyze_service_costs(self, now: datetime, days_back: int = 30) -> Tuple[List[CostAnalysis], Dict[str, float]]:
+        """Analyze costs by service up to now and identify trends, returning the analyses and their cost/savings totals"""
+        end_date = now.date()
         start_date = end_date - timedelta(days=days_back)
         mid_date = start_date + timedelta(days=days_back // 2)
         
-        # Get current period data
-        current_data = self.get_cost_and_usage(mid_date, end_date)
-        # Get previous period data for comparison
-        previous_data = self.get_cost_and_usage(start_date, mid_date)
-        
         analyses = []
-        
-        if not current_data or not previous_data:
+        totals = {'cost': 0.0, 'savings': 0.0}
+        
+        anomaly_impacts = None
+        if COST_TREND_SOURCE == 'anomalies':
+            anomaly_impacts = self.get_anomaly_impacts(mid_date, end_date, now)
+            if anomaly_impacts is None:
+                logger.warning("Cost Anomaly Detection unavailable, comparing against the previous period instead")
+        
+        if anomaly_impacts is None:
+            # Get both periods in one request; daily buckets are split locally
+            cost_data = self.get_cost_and_usage(start_date, end_date, now)
+        else:
+            # Only the current period is needed; trends come from Cost Anomaly Detection
+            cost_data = self.get_cost_and_usage(mid_date, end_date, now)
+        
+        if not cost_data:
             logger.warning("Unable to retrieve cost data for analysis")
-            return analyses
+            return analyses, totals
         
-        # Process current period costs
-        current_costs = self._extract_service_costs(current_data)
-        previous_costs = self._extract_service_costs(previous_data)
+        # Split costs into previous and current periods
+        previous_costs, current_costs = self._extract_service_costs(cost_data, mid_date.isoformat())
+        
+        if anomaly_impacts is not None:
+            # Compare against expected spend: actual cost minus the anomalous impact, never below zero
+            previous_costs = {
+                service: max(0.0, current_costs.get(service, 0.0) - anomaly_impacts.get(service, 0.0))
+                for service in self.services_to_analyze
+            }
         
         for service in self.services_to_analyze:
             current_cost = current_costs.get(service, 0.0)
             previous_cost = previous_costs.get(service, 0.0)
+            # Anomaly impacts are estimates; when they cover all spend there is no baseline to compare against
+            fully_anomalous = (
+                anomaly_impacts is not None and current_cost > 0 and previous_cost <= 0
+                and anomaly_impacts.get(service, 0.0) != 0
+            )
             
             if previous_cost > 0:
                 cost_change_percent = ((current_cost - previous_cost) / previous_cost) * 100
+            elif fully_anomalous:
+                cost_change_percent = 0.0
             else:
                 cost_change_percent = 100.0 if current_cost > 0 else 0.0
             
             # Generate optimization recommendations
             recommendations = self._generate_recommendations(service, current_cost, cost_change_percent)
+            if fully_anomalous:
+                recommendations.append("Spend flagged as anomalous by Cost Anomaly Detection - review the anomaly root causes")
             
             # Calculate optimization potential (estimated savings)
             optimization_potential = self._calculate_optimization_potential(service, current_cost)
@@ -137,76 +338,52 @@ class CostAnalyzer:
             )
             
             analyses.append(analysis)
+            totals['cost'] += current_cost
+            totals['savings'] += optimization_potential
         
-        return analyses
+        return analyses, totals
     
-    def _extract_service_costs(self, cost_data: Dict[str, Any]) -> Dict[str, float]:
-        """Extract service costs from Cost Explorer response"""
-        service_costs = {}
+    def _extract_service_costs(self, cost_data: Dict[str, Any], split_date: str) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Extract service costs from Cost Explorer response, split into periods before and from split_date"""
+        # Flatten groups into (service, period) codes and amounts: code = service_index * 2 + period
+        service_indexes = {}
+        codes = []
+        amounts = []
         
         for result in cost_data.get('ResultsByTime', []):
+            # TimePeriod dates are ISO formatted, so string comparison orders them correctly
+            period = 0 if result.get('TimePeriod', {}).get('Start', '') < split_date else 1
+            
             for group in result.get('Groups', []):
                 service_name = group.get('Keys', ['Unknown'])[0]
-                amount = float(group.get('Metrics', {}).get('BlendedCost', {}).get('Amount', '0'))
-                
-                if service_name in service_costs:
-                    service_costs[service_name] += amount
-                else:
-                    service_costs[service_name] = amount
-        
-        return service_costs
+                service_index = service_indexes.setdefault(service_name, len(service_indexes))
+                codes.append(service_index * 2 + period)
+                amounts.append(float(group.get('Metrics', {}).get('BlendedCost', {}).get('Amount', '0')))
+        
+        if len(amounts) >= VECTORIZE_MIN_GROUPS:
+            # Large windows: sum in C; numpy is imported lazily to keep it off the cold-start path
+            import numpy as np
+            sums = np.bincount(codes, weights=amounts, minlength=2 * len(service_indexes)).tolist()
+        else:
+            sums = [0.0] * (2 * len(service_indexes))
+            for code, amount in zip(codes, amounts):
+                sums[code] += amount
+        
+        previous_costs = {service: sums[index * 2] for service, index in service_indexes.items()}
+        current_costs = {service: sums[index * 2 + 1] for service, index in service_indexes.items()}
+        
+        return previous_costs, current_costs
     
     def _generate_recommendations(self, service: str, cost: float, change_percent: float) -> List[str]:
         """Generate cost optimization recommendations for a service"""
         recommendations = []
         
-        if 'Lambda' in service:
-            if cost > 50:  # High Lambda costs
-                recommendations.extend([
-                    "Consider optimizing Lambda memory allocation based on actual usage",
-                    "Review Lambda timeout settings to prevent unnecessary charges",
-                    "Implement caching to reduce Lambda invocation frequency",
-                    "Consider using Provisioned Concurrency only during peak hours"
-                ])
-            
-            if change_percent > 20:
-                recommendations.append("Lambda costs increased significantly - review recent deployment changes")
-        
-        elif 'Compute Cloud' in service:
-            if cost > 100:
-                recommendations.extend([
-                    "Consider using Spot Instances for CI/CD workloads",
-                    "Implement auto-shutdown for development environments",
-                    "Right-size instances based on actual CPU/memory usage",
-                    "Consider Reserved Instances for predictable workloads"
-                ])
-        
-        elif 'CloudWatch' in service:
-            if cost > 20:
-                recommendations.extend([
-                    "Review log retention policies - reduce retention for debug logs",
-                    "Consider sampling metrics for high-volume applications",
-                    "Use CloudWatch Insights queries efficiently",
-                    "Archive old logs to S3 for long-term storage"
-                ])
-        
-        elif 'Simple Storage Service' in service:
-            if cost > 30:
-                recommendations.extend([
-                    "Implement S3 lifecycle policies to transition to cheaper storage classes",
-                    "Clean up incomplete multipart uploads",
-                    "Use S3 Intelligent Tiering for unpredictable access patterns",
-                    "Compress artifacts before storing in S3"
-                ])
-        
-        elif 'DynamoDB' in service:
-            if cost > 25:
-                recommendations.extend([
-                    "Consider on-demand billing for unpredictable workloads",
-                    "Optimize table design to reduce read/write operations",
-                    "Use DynamoDB auto scaling for consistent workloads",
-                    "Archive old data to S3 for cost savings"
-                ])
+        _, cost_threshold, service_recommendations = SERVICE_PROFILES.get(service, DEFAULT_SERVICE_PROFILE)
+        if cost > cost_threshold:
+            recommendations.extend(service_recommendations)
+        
+        if service == 'AWS Lambda' and change_percent > 20:
+            recommendations.append("Lambda costs increased significantly - review recent deployment changes")
         
         # General recommendations for cost increases
         if change_percent > 50:
@@ -218,17 +395,8 @@ class CostAnalyzer:
     
     def _calculate_optimization_potential(self, service: str, current_cost: float) -> float:
         """Calculate potential cost savings for a service"""
-        # Conservative estimates of potential savings
-        optimization_rates = {
-            'AWS Lambda': 0.15,  # 15% through memory optimization and caching
-            'Amazon Elastic Compute Cloud - Compute': 0.30,  # 30% through spot instances and right-sizing
-            'Amazon CloudWatch': 0.25,  # 25% through log retention and sampling
-            'Amazon Simple Storage Service': 0.20,  # 20% through lifecycle policies
-            'Amazon DynamoDB': 0.15,  # 15% through capacity optimization
-            'AWS CodeBuild': 0.10   # 10% through build optimization
-        }
-        
-        rate = optimization_rates.get(service, 0.10)  # Default 10% potential savings
+        # Conservative estimates of potential savings, default 10%
+        rate, _, _ = SERVICE_PROFILES.get(service, DEFAULT_SERVICE_PROFILE)
         return current_cost * rate
 
 class ResourceOptimizer:
@@ -236,79 +404,114 @@ class ResourceOptimizer:
     
     def __init__(self):
         self.optimization_actions = []
+        self.function_configs = {}
     
-    def analyze_lambda_utilization(self) -> List[ResourceUtilization]:
-        """Analyze Lambda function utilization and costs"""
+    def analyze_lambda_utilization(self, now: datetime) -> List[ResourceUtilization]:
+        """Analyze Lambda function utilization and costs over the week up to now"""
         utilizations = []
         
         try:
-            # Get list of Lambda functions
-            paginator = lambda_client.get_paginator('list_functions')
+            # Get list of Lambda functions, keeping only the configuration fields we use
+            paginator = get_client('lambda').get_paginator('list_functions')
+            functions = paginator.paginate().search(
+                'Functions[].{FunctionName: FunctionName, MemorySize: MemorySize, Timeout: Timeout}'
+            )
             
-            for page in paginator.paginate():
-                for function in page['Functions']:
-                    function_name = function['FunctionName']
-                    
-                    # Skip if not related to CI/CD monitoring
-                    if not any(keyword in function_name.lower() for keyword in ['ci', 'cd', 'pipeline', 'monitor']):
-                        continue
-                    
-                    utilization = self._analyze_lambda_function(function_name)
-                    if utilization:
-                        utilizations.append(utilization)
+            for function in functions:
+                function_name = function['FunctionName']
+                
+                # Skip if not related to CI/CD monitoring
+                if not CI_FUNCTION_PATTERN.search(function_name):
+                    continue
+                
+                self.function_configs[function_name] = function
+            
+            function_names = list(self.function_configs)
+            
+            # Fetch metrics for all functions up front in batched requests
+            end_time = now
+            start_time = end_time - timedelta(days=7)  # Last 7 days
+            function_metrics = self._get_lambda_metrics(function_names, start_time, end_time)
+            
+            for function_name in function_names:
+                utilization = self._analyze_lambda_function(
+                    self.function_configs[function_name], function_metrics.get(function_name)
+                )
+                if utilization:
+                    utilizations.append(utilization)
         
         except ClientError as e:
             logger.error(f"Error analyzing Lambda utilization: {str(e)}")
         
         return utilizations
     
-    def _analyze_lambda_function(self, function_name: str) -> Optional[ResourceUtilization]:
+    def _get_lambda_metrics(self, function_names: List[str], start_time: datetime, end_time: datetime) -> Dict[str, Dict[str, List[float]]]:
+        """Get hourly invocation and duration values for Lambda functions using batched GetMetricData calls"""
+        function_metrics = {}
+        queries = []
+        query_targets = {}
+        
+        for index, function_name in enumerate(function_names):
+            function_metrics[function_name] = {'invocations': [], 'duration_avg': [], 'duration_max': []}
+            dimensions = [{'Name': 'FunctionName', 'Value': function_name}]
+            
+            for prefix, field, metric_name, stat in (
+                ('inv', 'invocations', 'Invocations', 'Sum'),
+                ('dur_avg', 'duration_avg', 'Duration', 'Average'),
+                ('dur_max', 'duration_max', 'Duration', 'Maximum')
+            ):
+                query_id = f"{prefix}_{index}"
+                query_targets[query_id] = (function_name, field)
+                queries.append({
+                    'Id': query_id,
+                    'MetricStat': {
+                        'Metric': {
+                            'Namespace': 'AWS/Lambda',
+                            'MetricName': metric_name,
+                            'Dimensions': dimensions
+                        },
+                        'Period': 3600,  # 1 hour
+                        'Stat': stat
+                    },
+                    'ReturnData': True
+                })
+        
+        # GetMetricData accepts up to 500 queries per request
+        batch_size = 500
+        paginator = get_client('cloudwatch').get_paginator('get_metric_data')
+        for i in range(0, len(queries), batch_size):
+            for page in paginator.paginate(
+                MetricDataQueries=queries[i:i + batch_size],
+                StartTime=start_time,
+                EndTime=end_time
+            ):
+                for result in page.get('MetricDataResults', []):
+                    function_name, field = query_targets[result['Id']]
+                    function_metrics[function_name][field].extend(result.get('Values', []))
+        
+        return function_metrics
+    
+    def _analyze_lambda_function(self, config: Dict[str, Any], metrics: Optional[Dict[str, List[float]]]) -> Optional[ResourceUtilization]:
         """Analyze individual Lambda function utilization"""
+        function_name = config['FunctionName']
         try:
-            # Get function configuration
-            config = lambda_client.get_function_configuration(FunctionName=function_name)
+            # Configuration comes from list_functions, no extra lookup needed
             memory_mb = config['MemorySize']
             timeout_seconds = config['Timeout']
             
-            # Get CloudWatch metrics for the function
-            end_time = datetime.now()
-            start_time = end_time - timedelta(days=7)  # Last 7 days
-            
-            # Get invocation count
-            invocations_response = cloudwatch.get_metric_statistics(
-                Namespace='AWS/Lambda',
-                MetricName='Invocations',
-                Dimensions=[{'Name': 'FunctionName', 'Value': function_name}],
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=3600,  # 1 hour
-                Statistics=['Sum']
-            )
-            
-            # Get duration metrics
-            duration_response = cloudwatch.get_metric_statistics(
-                Namespace='AWS/Lambda',
-                MetricName='Duration',
-                Dimensions=[{'Name': 'FunctionName', 'Value': function_name}],
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=3600,
-                Statistics=['Average', 'Maximum']
-            )
-            
-            if not duration_response['Datapoints']:
+            if not metrics or not metrics.get('duration_avg'):
                 return None
             
             # Calculate utilization metrics
-            avg_duration = statistics.mean([dp['Average'] for dp in duration_response['Datapoints']])
-            max_duration = max([dp['Maximum'] for dp in duration_response['Datapoints']])
+            avg_duration = statistics.fmean(metrics['duration_avg'])
+            max_duration = max(metrics['duration_max'], default=avg_duration)
             
             # Calculate utilization as percentage of timeout used
             avg_utilization = (avg_duration / (timeout_seconds * 1000)) * 100  # Convert to percentage
             max_utilization = (max_duration / (timeout_seconds * 1000)) * 100
             
             # Estimate cost (rough calculation)
-            total_invocations = sum([dp['Sum'] for dp in invocations_response['Datapoints']])
+            total_invocations = sum(metrics['invocations'])
             gb_seconds = (memory_mb / 1024) * (avg_duration / 1000) * total_invocations
             estimated_cost = gb_seconds * 0.0000166667  # AWS Lambda pricing (approximate)
             
@@ -326,7 +529,7 @@ class ResourceOptimizer:
                 optimization_score=optimization_score
             )
             
-        except ClientError as e:
+        except (KeyError, TypeError, ValueError, ZeroDivisionError) as e:
             logger.error(f"Error analyzing Lambda function {function_name}: {str(e)}")
             return None
     
@@ -356,20 +559,23 @@ class ResourceOptimizer:
     
     def implement_optimizations(self, utilizations: List[ResourceUtilization]) -> List[str]:
         """Implement resource optimizations based on utilization analysis"""
-        actions = []
+        candidates = [
+            util for util in utilizations
+            if util.resource_type == 'lambda' and util.optimization_score >= 3
+        ]
         
-        for util in utilizations:
-            if util.resource_type == 'lambda' and util.optimization_score >= 3:
-                action = self._optimize_lambda_function(util)
-                if action:
-                    actions.append(action)
+        if not candidates:
+            return []
         
-        return actions
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            return [action for action in executor.map(self._optimize_lambda_function, candidates) if action]
     
     def _optimize_lambda_function(self, util: ResourceUtilization) -> Optional[str]:
         """Optimize Lambda function configuration"""
         try:
-            current_config = lambda_client.get_function_configuration(FunctionName=util.resource_id)
+            current_config = self.function_configs.get(util.resource_id)
+            if current_config is None:
+                current_config = get_client('lambda').get_function_configuration(FunctionName=util.resource_id)
             current_memory = current_config['MemorySize']
             
             # Calculate optimal memory based on utilization
@@ -387,7 +593,7 @@ class ResourceOptimizer:
                 return None
             
             # Update function configuration
-            lambda_client.update_function_configuration(
+            get_client('lambda').update_function_configuration(
                 FunctionName=util.resource_id,
                 MemorySize=new_memory
             )
@@ -402,14 +608,64 @@ class ResourceOptimizer:
             logger.error(f"Error optimizing Lambda function {util.resource_id}: {str(e)}")
             return None
 
-def save_cost_analysis_to_s3(analyses: List[CostAnalysis], utilizations: List[ResourceUtilization]):
+# Most recent cost analysis report read by this container; report objects are never rewritten
+_recent_report = {'key': None, 'data': None}
+
+def load_recent_cost_analyses(services: List[str], now: datetime) -> Optional[Tuple[List[CostAnalysis], Dict[str, float], datetime]]:
+    """Load the cost analyses from today's latest report if its costs are still fresh and cover the same services"""
+    if not S3_BUCKET:
+        return None
+
+    try:
+        response = get_client('s3').list_objects_v2(
+            Bucket=S3_BUCKET,
+            Prefix=f"cost-analysis/{now.strftime('%Y/%m/%d')}/"
+        )
+
+        reports = response.get('Contents', [])
+        if not reports:
+            return None
+
+        latest = max(reports, key=lambda obj: obj['LastModified'])
+        if now - latest['LastModified'] > timedelta(hours=CACHE_MAX_AGE_HOURS):
+            return None
+
+        # Only download the report if this container has not already read it
+        if _recent_report['key'] != latest['Key']:
+            body = get_client('s3').get_object(Bucket=S3_BUCKET, Key=latest['Key'])['Body'].read()
+            if latest['Key'].endswith('.gz'):
+                body = gzip.decompress(body)
+            _recent_report['data'] = json.loads(body)
+            _recent_report['key'] = latest['Key']
+
+        report = _recent_report['data']
+        if [a['service'] for a in report.get('cost_analyses', [])] != services:
+            return None
+
+        # Reports built from reused costs keep the original fetch time, so costs still refresh on schedule
+        cost_timestamp = datetime.fromisoformat(report.get('cost_timestamp', report['timestamp']))
+        if now - cost_timestamp > timedelta(hours=CACHE_MAX_AGE_HOURS):
+            return None
+
+        analyses = [CostAnalysis(**analysis) for analysis in report['cost_analyses']]
+        totals = {'cost': report['total_current_cost'], 'savings': report['total_optimization_potential']}
+        return analyses, totals, cost_timestamp
+
+    except ClientError as e:
+        logger.warning(f"Error checking for recent cost analysis: {str(e)}")
+        return None
+    except (OSError, EOFError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable cost analysis report: {str(e)}")
+        return None
+
+def save_cost_analysis_to_s3(analyses: List[CostAnalysis], utilizations: List[ResourceUtilization], totals: Dict[str, float], summary: Dict[str, Any], now: datetime, cost_timestamp: datetime):
     """Save cost analysis results to S3"""
     try:
-        timestamp = datetime.now()
-        key = f"cost-analysis/{timestamp.strftime('%Y/%m/%d')}/analysis-{int(timestamp.timestamp())}.json"
+        key = f"cost-analysis/{now.strftime('%Y/%m/%d')}/analysis-{int(now.timestamp())}.json.gz"
         
         data = {
-            'timestamp': timestamp.isoformat(),
+            'timestamp': now.isoformat(),
+            'cost_timestamp': cost_timestamp.isoformat(),
             'cost_analyses': [
                 {
                     'service': a.service,
@@ -432,92 +688,84 @@ def save_cost_analysis_to_s3(analyses: List[CostAnalysis], utilizations: List[Re
                 }
                 for u in utilizations
             ],
-            'total_current_cost': sum(a.current_cost for a in analyses),
-            'total_optimization_potential': sum(a.optimization_potential for a in analyses)
+            'total_current_cost': totals['cost'],
+            'total_optimization_potential': totals['savings'],
+            'summary': summary
         }
         
-        s3.put_object(
+        get_client('s3').put_object(
             Bucket=S3_BUCKET,
             Key=key,
-            Body=json.dumps(data, default=str),
+            # Repetitive field names and service strings compress well
+            Body=gzip.compress(json.dumps(data, default=str).encode('utf-8'), compresslevel=6),
             ContentType='application/json',
+            ContentEncoding='gzip',
             ServerSideEncryption='aws:kms'
         )
         
+        # The next warm invocation finds this report as the latest; no need to download it again
+        _recent_report['key'] = key
+        _recent_report['data'] = data
+        
         logger.info(f"Saved cost analysis to S3: s3://{S3_BUCKET}/{key}")
         
     except ClientError as e:
         logger.error(f"Error saving cost analysis to S3: {str(e)}")
 
-def publish_cost_metrics(analyses: List[CostAnalysis]):
-    """Publish cost metrics to CloudWatch"""
-    try:
-        timestamp = datetime.now()
-        metric_data = []
-        
-        total_cost = sum(a.current_cost for a in analyses)
-        total_optimization_potential = sum(a.optimization_potential for a in analyses)
-        
-        # Overall cost metrics
-        metric_data.extend([
-            {
-                'MetricName': 'TotalCostUSD',
-                'Value': total_cost,
-                'Unit': 'None',
-                'Timestamp': timestamp
-            },
-            {
-                'MetricName': 'OptimizationPotentialUSD',
-                'Value': total_optimization_potential,
-                'Unit': 'None',
-                'Timestamp': timestamp
-            },
-            {
-                'MetricName': 'PotentialSavingsPercent',
-                'Value': (total_optimization_potential / total_cost * 100) if total_cost > 0 else 0,
-                'Unit': 'Percent',
-                'Timestamp': timestamp
-            }
-        ])
-        
-        # Service-specific metrics
-        for analysis in analyses:
-            if analysis.current_cost > 0:  # Only include services with costs
-                metric_data.extend([
-                    {
-                        'MetricName': 'ServiceCostUSD',
-                        'Value': analysis.current_cost,
-                        'Unit': 'None',
-                        'Timestamp': timestamp,
-                        'Dimensions': [{'Name': 'Service', 'Value': analysis.service}]
-                    },
-                    {
-                        'MetricName': 'ServiceCostChangePercent',
-                        'Value': analysis.cost_change_percent,
-                        'Unit': 'Percent',
-                        'Timestamp': timestamp,
-                        'Dimensions': [{'Name': 'Service', 'Value': analysis.service}]
-                    }
-                ])
-        
-        # Publish metrics in batches
-        batch_size = 20
-        for i in range(0, len(metric_data), batch_size):
-            batch = metric_data[i:i + batch_size]
-            cloudwatch.put_metric_data(
-                Namespace='CI-CD/Cost',
-                MetricData=batch
-            )
-        
-        logger.info(f"Published {len(metric_data)} cost metrics to CloudWatch")
-        
-    except ClientError as e:
-        logger.error(f"Error publishing cost metrics: {str(e)}")
+def publish_cost_metrics(analyses: List[CostAnalysis], totals: Dict[str, float], now: datetime):
+    """Publish cost metrics to CloudWatch using Embedded Metric Format log lines"""
+    timestamp = int(now.timestamp() * 1000)
+    
+    total_cost = totals['cost']
+    total_optimization_potential = totals['savings']
+    
+    # Overall cost metrics
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': timestamp,
+            'CloudWatchMetrics': [{
+                'Namespace': 'CI-CD/Cost',
+                'Dimensions': [[]],
+                'Metrics': [
+                    {'Name': 'TotalCostUSD', 'Unit': 'None'},
+                    {'Name': 'OptimizationPotentialUSD', 'Unit': 'None'},
+                    {'Name': 'PotentialSavingsPercent', 'Unit': 'Percent'}
+                ]
+            }]
+        },
+        'TotalCostUSD': total_cost,
+        'OptimizationPotentialUSD': total_optimization_potential,
+        'PotentialSavingsPercent': (total_optimization_potential / total_cost * 100) if total_cost > 0 else 0
+    }))
+    
+    # Service-specific metrics
+    published = 3
+    for analysis in analyses:
+        if analysis.current_cost > 0:  # Only include services with costs
+            print(json.dumps({
+                '_aws': {
+                    'Timestamp': timestamp,
+                    'CloudWatchMetrics': [{
+                        'Namespace': 'CI-CD/Cost',
+                        'Dimensions': [['Service']],
+                        'Metrics': [
+                            {'Name': 'ServiceCostUSD', 'Unit': 'None'},
+                            {'Name': 'ServiceCostChangePercent', 'Unit': 'Percent'}
+                        ]
+                    }]
+                },
+                'Service': analysis.service,
+                'ServiceCostUSD': analysis.current_cost,
+                'ServiceCostChangePercent': analysis.cost_change_percent
+            }))
+            published += 2
+    
+    logger.info(f"Emitted {published} cost metrics as EMF log events")
 
-def send_cost_alerts(analyses: List[CostAnalysis], optimization_actions: List[str]):
+def send_cost_alerts(analyses: List[CostAnalysis], totals: Dict[str, float], optimization_actions: List[str], now: datetime):
     """Send cost alerts and optimization notifications"""
-    total_cost = sum(a.current_cost for a in analyses)
-    total_savings_potential = sum(a.optimization_potential for a in analyses)
+    total_cost = totals['cost']
+    total_savings_potential = totals['savings']
     
     alerts = []
     
@@ -539,12 +787,12 @@ def send_cost_alerts(analyses: List[CostAnalysis], optimization_actions: List[st
             'details': [f"{s.service}: +{s.cost_change_percent:.1f}%" for s in high_increase_services]
         })
     
-    # Send optimization summary if significant savings are possible
+    # Include optimization summary if significant savings are possible
+    optimization_report = None
     if total_savings_potential > 20:  # More than $20 potential savings
-        message = {
+        optimization_report = {
             'alert_type': 'cost_optimization',
             'severity': 'INFO',
-            'timestamp': datetime.now().isoformat(),
             'total_cost': total_cost,
             'savings_potential': total_savings_potential,
             'savings_percent': (total_savings_potential / total_cost * 100) if total_cost > 0 else 0,
@@ -559,44 +807,78 @@ def send_cost_alerts(analyses: List[CostAnalysis], optimization_actions: List[st
                 for a in analyses if a.optimization_potential > 5
             ]
         }
-        
-        try:
-            sns.publish(
-                TopicArn=SNS_COST_TOPIC,
-                Message=json.dumps(message, default=str),
-                Subject=f"CI/CD Cost Optimization Report - ${total_savings_potential:.2f} potential savings"
-            )
-            logger.info(f"Sent cost optimization report with ${total_savings_potential:.2f} potential savings")
-        except ClientError as e:
-            logger.error(f"Error sending cost optimization report: {str(e)}")
     
-    # Send alerts
-    for alert in alerts:
-        try:
-            sns.publish(
-                TopicArn=SNS_COST_TOPIC,
-                Message=json.dumps(alert, default=str),
-                Subject=f"CI/CD Cost Alert: {alert['message']}"
-            )
+    if not alerts and not optimization_report:
+        return
+    
+    # Send alerts and optimization summary as a single notification; subscribers can
+    # filter on the alert_types/severity message attributes
+    alert_types = [alert['type'] for alert in alerts]
+    if optimization_report:
+        alert_types.append('cost_optimization')
+    severity = 'WARNING' if alerts else 'INFO'
+    
+    message = {
+        'alert_type': 'cost_report',
+        'severity': severity,
+        'timestamp': now.isoformat(),
+        'alerts': alerts,
+        'optimization': optimization_report
+    }
+    
+    if len(alerts) == 1:
+        subject = f"CI/CD Cost Alert: {alerts[0]['message']}"
+    elif alerts:
+        subject = f"CI/CD Cost Alert: {len(alerts)} cost alerts"
+    else:
+        subject = f"CI/CD Cost Optimization Report - ${total_savings_potential:.2f} potential savings"
+    
+    try:
+        get_client('sns').publish(
+            TopicArn=SNS_COST_TOPIC,
+            Message=json.dumps(message, default=str),
+            Subject=subject,
+            MessageAttributes={
+                'alert_types': {'DataType': 'String.Array', 'StringValue': json.dumps(alert_types)},
+                'severity': {'DataType': 'String', 'StringValue': severity}
+            }
+        )
+        for alert in alerts:
             logger.warning(f"Sent cost alert: {alert['message']}")
-        except ClientError as e:
-            logger.error(f"Error sending cost alert: {str(e)}")
+        if optimization_report:
+            logger.info(f"Sent cost optimization report with ${total_savings_potential:.2f} potential savings")
+    except ClientError as e:
+        logger.error(f"Error sending cost notification: {str(e)}")
 
 def handler(event, context):
     """Lambda handler for cost optimization"""
     logger.info("Starting cost optimization analysis")
     
+    # Single event time shared by the S3 report, metrics and notifications
+    now = datetime.now(timezone.utc)
+    
     try:
         # Initialize analyzers
         cost_analyzer = CostAnalyzer()
         resource_optimizer = ResourceOptimizer()
         
-        # Analyze service costs
-        cost_analyses = cost_analyzer.analyze_service_costs(days_back=30)
-        logger.info(f"Analyzed costs for {len(cost_analyses)} services")
+        # Cost Explorer data only refreshes a few times a day, so costs from a fresh report are reused;
+        # utilization, scaling, metrics and alerts still run every invocation
+        recent_costs = None
+        if not (event or {}).get('force_refresh'):
+            recent_costs = load_recent_cost_analyses(cost_analyzer.services_to_analyze, now)
+        
+        if recent_costs:
+            cost_analyses, cost_totals, cost_timestamp = recent_costs
+            logger.info(f"Reusing cost analysis from {cost_timestamp.isoformat()}, skipping Cost Explorer")
+        else:
+            # Analyze service costs
+            cost_analyses, cost_totals = cost_analyzer.analyze_service_costs(now, days_back=30)
+            cost_timestamp = now
+            logger.info(f"Analyzed costs for {len(cost_analyses)} services")
         
         # Analyze resource utilization
-        utilizations = resource_optimizer.analyze_lambda_utilization()
+        utilizations = resource_optimizer.analyze_lambda_utilization(now)
         logger.info(f"Analyzed utilization for {len(utilizations)} Lambda functions")
         
         # Implement optimizations if enabled
@@ -605,22 +887,10 @@ def handler(event, context):
             optimization_actions = resource_optimizer.implement_optimizations(utilizations)
             logger.info(f"Implemented {len(optimization_actions)} optimization actions")
         
-        # Save analysis results
-        save_cost_analysis_to_s3(cost_analyses, utilizations)
-        
-        # Publish metrics
-        publish_cost_metrics(cost_analyses)
-        
-        # Send alerts and recommendations
-        send_cost_alerts(cost_analyses, optimization_actions)
-        
         # Prepare summary response
-        total_cost = sum(a.current_cost for a in cost_analyses)
-        total_savings_potential = sum(a.optimization_potential for a in cost_analyses)
-        
         summary = {
-            'total_cost': total_cost,
-            'savings_potential': total_savings_potential,
+            'total_cost': cost_totals['cost'],
+            'savings_potential': cost_totals['savings'],
             'services_analyzed': len(cost_analyses),
             'resources_analyzed': len(utilizations),
             'optimization_actions': len(optimization_actions),
@@ -634,6 +904,15 @@ def handler(event, context):
             ]
         }
         
+        # Save analysis results
+        save_cost_analysis_to_s3(cost_analyses, utilizations, cost_totals, summary, now, cost_timestamp)
+        
+        # Publish metrics
+        publish_cost_metrics(cost_analyses, cost_totals, now)
+        
+        # Send alerts and recommendations
+        send_cost_alerts(cost_analyses, cost_totals, optimization_actions, now)
+        
         logger.info(f"Cost optimization completed: {json.dumps(summary, default=str)}")
         
         return {
@@ -649,12 +928,12 @@ def handler(event, context):
         
         # Send failure alert
         try:
-            sns.publish(
+            get_client('sns').publish(
                 TopicArn=SNS_COST_TOPIC,
                 Message=json.dumps({
                     'alert_type': 'cost_optimizer_failure',
                     'severity': 'ERROR',
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': now.isoformat(),
                     'error': str(e)
                 }, default=str),
                 Subject="CI/CD Cost Optimizer Failed"
@@ -4,16 +4,20 @@ Tracks performance baselines, detects regressions, and optimizes resource utiliz
 """
 
 import json
+import gzip
 import boto3
 import os
+import math
+import time
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional, Tuple
-import requests
+import urllib3
+from urllib3.util.retry import Retry
 from botocore.exceptions import ClientError
-import statistics
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Configure logging
 logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
@@ -22,7 +26,6 @@ logger = logging.getLogger(__name__)
 # AWS clients
 cloudwatch = boto3.client('cloudwatch')
 s3 = boto3.client('s3')
-sns = boto3.client('sns')
 secrets_manager = boto3.client('secretsmanager')
 
 # Configuration
@@ -31,6 +34,29 @@ GITHUB_OWNER = os.getenv('GITHUB_OWNER')
 GITHUB_REPO = os.getenv('GITHUB_REPO')
 S3_BUCKET = os.getenv('S3_BUCKET')
 CLOUDWATCH_NAMESPACE = os.getenv('CLOUDWATCH_NAMESPACE', 'CI-CD/Performance')
+GITHUB_TOKEN_TTL = int(os.getenv('GITHUB_TOKEN_TTL', '3600'))  # Seconds a warm container reuses the token
+
+# GitHub workflow run pagination
+RUNS_PER_PAGE = 100
+MAX_RUN_PAGES = 10  # Limit to prevent excessive API calls
+MAX_CONCURRENT_PAGES = 5
+# The only run fields the extractors read; everything else in the REST payload is dropped
+RUN_FIELDS = ('id', 'created_at', 'updated_at', 'run_started_at', 'conclusion')
+
+MAX_CONCURRENT_PUTS = 8  # Parallel PutMetricData batches
+
+_SQRT2 = math.sqrt(2.0)
+SEVERITY_LEVELS = ('info', 'minor', 'major', 'critical')
+
+
+# Conditional-request cache kept across warm invocations: (url, params) -> (etag, page)
+# GitHub answers 304 Not Modified for unchanged pages without charging the rate limit.
+# Persisted to S3 so cold starts can revalidate too
+ETAG_CACHE_KEY = "performance-baselines/github-etags.json"
+_etag_cache: Dict[Tuple, Tuple[str, Dict[str, Any]]] = {}
+
+# GitHub token kept across warm invocations to skip a Secrets Manager call per run
+_token_cache = {'value': None, 'expires_at': 0.0}
 
 
 class ConfigurationError(Exception):
@@ -38,6 +64,11 @@ class ConfigurationError(Exception):
     pass
 
 
+class GitHubAPIError(Exception):
+    """Raised when a GitHub API request fails or returns an error status"""
+    pass
+
+
 def validate_environment():
     """Validate required environment variables"""
     required_vars = {
@@ -54,7 +85,10 @@ def validate_environment():
 
 
 def get_github_token() -> str:
-    """Retrieve GitHub token from AWS Secrets Manager"""
+    """Retrieve GitHub token from AWS Secrets Manager, reusing it for GITHUB_TOKEN_TTL seconds"""
+    if _token_cache['value'] and time.monotonic() < _token_cache['expires_at']:
+        return _token_cache['value']
+
     try:
         response = secrets_manager.get_secret_value(SecretId=GITHUB_SECRET_ARN)
 
@@ -65,6 +99,8 @@ def get_github_token() -> str:
             if not token:
                 raise ConfigurationError("GitHub token not found in secret")
 
+            _token_cache['value'] = token
+            _token_cache['expires_at'] = time.monotonic() + GITHUB_TOKEN_TTL
             return token
         else:
             raise ConfigurationError("Secret does not contain string data")
@@ -79,7 +115,7 @@ def get_github_token() -> str:
             raise ConfigurationError(f"Error retrieving secret: {str(e)}")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PerformanceBaseline:
     """Performance baseline data structure"""
     metric_name: str
@@ -90,9 +126,16 @@ class PerformanceBaseline:
     sample_count: int
     last_updated: datetime
     confidence_interval: Tuple[float, float]
+    # Reciprocals precomputed once so regression checks multiply instead of divide; 0 when undefined
+    inv_mean: float = field(init=False, repr=False, compare=False)
+    inv_std: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'inv_mean', 1.0 / self.mean if self.mean != 0 else 0.0)
+        object.__setattr__(self, 'inv_std', 1.0 / self.std_dev if self.std_dev > 0 else 0.0)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PerformanceRegression:
     """Performance regression detection result"""
     metric_name: str
@@ -103,6 +146,36 @@ class PerformanceRegression:
     statistical_significance: float
 
 
+def _sorted_percentiles(sorted_values: np.ndarray, percentiles: List[float]) -> np.ndarray:
+    """Linearly interpolated percentiles (numpy's default method) of an already sorted array"""
+    positions = np.asarray(percentiles, dtype=np.float64) / 100.0 * (sorted_values.size - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, sorted_values.size - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (positions - lower)
+
+
+def _baseline_kernel(values: np.ndarray, min_samples: int) -> Tuple[float, float, float, float, int]:
+    """IQR-filtered (mean, std_dev, p95, p99, sample_count) of a sample, from a single sort"""
+    ordered = np.sort(values)
+
+    # Remove outliers using IQR method; on sorted data the kept values are one contiguous slice
+    q1, q3 = _sorted_percentiles(ordered, [25, 75])
+    iqr = q3 - q1
+    lo = np.searchsorted(ordered, q1 - 1.5 * iqr, side='left')
+    hi = np.searchsorted(ordered, q3 + 1.5 * iqr, side='right')
+    filtered = ordered[lo:hi]
+
+    if filtered.size < min_samples:
+        logger.warning("Too many outliers removed, using original values")
+        filtered = ordered
+
+    sample_count = int(filtered.size)
+    mean = float(filtered.mean())
+    std_dev = float(filtered.std(ddof=1)) if sample_count > 1 else 0.0
+    percentile_95, percentile_99 = _sorted_percentiles(filtered, [95, 99])
+    return mean, std_dev, float(percentile_95), float(percentile_99), sample_count
+
+
 class PerformanceAnalyzer:
     """Statistical analysis for performance metrics"""
 
@@ -115,9 +188,10 @@ class PerformanceAnalyzer:
         self.min_samples_for_baseline = 10
         self.confidence_level = 0.95
 
-    def calculate_baseline(self, values: List[float]) -> Optional[PerformanceBaseline]:
+    def calculate_baseline(self, metric_name: str, values: np.ndarray,
+                           now: Optional[datetime] = None) -> Optional[PerformanceBaseline]:
         """Calculate performance baseline from historical data"""
-        if not values:
+        if len(values) == 0:
             logger.warning("Empty values list for baseline calculation")
             return None
 
@@ -126,34 +200,22 @@ class PerformanceAnalyzer:
             return None
 
         try:
-            # Remove outliers using IQR method
-            q1 = np.percentile(values, 25)
-            q3 = np.percentile(values, 75)
-            iqr = q3 - q1
-            lower_bound = q1 - 1.5 * iqr
-            upper_bound = q3 + 1.5 * iqr
-
-            filtered_values = [v for v in values if lower_bound <= v <= upper_bound]
-
-            if len(filtered_values) < self.min_samples_for_baseline:
-                logger.warning("Too many outliers removed, using original values")
-                filtered_values = values
-
-            mean = statistics.mean(filtered_values)
-            std_dev = statistics.stdev(filtered_values) if len(filtered_values) > 1 else 0
+            mean, std_dev, percentile_95, percentile_99, sample_count = _baseline_kernel(
+                np.asarray(values, dtype=np.float64), self.min_samples_for_baseline
+            )
 
             # Calculate confidence interval
-            margin_of_error = 1.96 * (std_dev / np.sqrt(len(filtered_values)))  # 95% confidence
+            margin_of_error = 1.96 * (std_dev / math.sqrt(sample_count))  # 95% confidence
             confidence_interval = (mean - margin_of_error, mean + margin_of_error)
 
             return PerformanceBaseline(
-                metric_name="",  # Will be set by caller
+                metric_name=metric_name,
                 mean=mean,
                 std_dev=std_dev,
-                percentile_95=np.percentile(filtered_values, 95),
-                percentile_99=np.percentile(filtered_values, 99),
-                sample_count=len(filtered_values),
-                last_updated=datetime.now(),
+                percentile_95=percentile_95,
+                percentile_99=percentile_99,
+                sample_count=sample_count,
+                last_updated=now or datetime.now(timezone.utc),
                 confidence_interval=confidence_interval
             )
 
@@ -161,114 +223,180 @@ class PerformanceAnalyzer:
             logger.error(f"Error calculating baseline: {str(e)}")
             return None
 
-    def detect_regression(self, current_value: float, baseline: PerformanceBaseline) -> Optional[PerformanceRegression]:
-        """Detect performance regression against baseline"""
-        if not baseline or baseline.mean == 0:
-            return None
+    def detect_regressions(self, current_values: Dict[str, float],
+                           baselines: Dict[str, PerformanceBaseline]) -> List[PerformanceRegression]:
+        """Detect performance regressions for all metrics against their baselines in one pass"""
+        names = [name for name in current_values if baselines.get(name) and baselines[name].mean != 0]
+        if not names:
+            return []
+
+        current = np.array([current_values[name] for name in names], dtype=np.float64)
+        means = np.array([baselines[name].mean for name in names], dtype=np.float64)
+        std_devs = np.array([baselines[name].std_dev for name in names], dtype=np.float64)
+        inv_means = np.array([baselines[name].inv_mean for name in names], dtype=np.float64)
+        inv_stds = np.array([baselines[name].inv_std for name in names], dtype=np.float64)
 
         # Calculate regression percentage
-        regression_percent = (current_value - baseline.mean) / baseline.mean
+        deviation = current - means
+        regression_percent = deviation * inv_means
 
+        # Determine severity: 0 = info, 1 = minor, 2 = major, 3 = critical
+        severity_index = np.digitize(regression_percent, [
+            self.regression_thresholds['minor'],
+            self.regression_thresholds['major'],
+            self.regression_thresholds['critical']
+        ])
+
+        # Z-score where the baseline has spread; inv_std is 0 otherwise, yielding a zero score
+        z_scores = np.abs(deviation * inv_stds)
+
+        regressions = []
         # Only consider it a regression if performance degraded
-        if regression_percent <= 0:
-            return None
+        for i in np.flatnonzero(regression_percent > 0):
+            if std_devs[i] > 0:
+                # Two-sided normal confidence, 2 * CDF(z) - 1 == erf(z / sqrt(2)), already in 0-1
+                statistical_significance = math.erf(z_scores[i] / _SQRT2)
+            else:
+                statistical_significance = 1.0 if regression_percent[i] > 0.01 else 0.0
 
-        # Determine severity
-        severity = 'info'
-        if regression_percent >= self.regression_thresholds['critical']:
-            severity = 'critical'
-        elif regression_percent >= self.regression_thresholds['major']:
-            severity = 'major'
-        elif regression_percent >= self.regression_thresholds['minor']:
-            severity = 'minor'
-
-        # Calculate statistical significance (Z-score)
-        if baseline.std_dev > 0:
-            z_score = abs((current_value - baseline.mean) / baseline.std_dev)
-            # Use normal distribution CDF for significance
-            statistical_significance = min(1.0, z_score / 3.0)  # Normalize to 0-1
-        else:
-            statistical_significance = 1.0 if regression_percent > 0.01 else 0.0
-
-        return PerformanceRegression(
-            metric_name=baseline.metric_name,
-            current_value=current_value,
-            baseline_value=baseline.mean,
-            regression_percent=regression_percent,
-            severity=severity,
-            statistical_significance=statistical_significance
-        )
+            regressions.append(PerformanceRegression(
+                metric_name=names[i],
+                current_value=float(current[i]),
+                baseline_value=float(means[i]),
+                regression_percent=float(regression_percent[i]),
+                severity=SEVERITY_LEVELS[severity_index[i]],
+                statistical_significance=statistical_significance
+            ))
+
+        return regressions
 
 
 class GitHubMetricsCollector:
     """Collects performance metrics from GitHub Actions"""
 
     def __init__(self, github_token: str):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Authorization': f'token {github_token}',
+        # Only api.github.com is called, so one keep-alive pool sized for the concurrent page fetches
+        self.http = urllib3.PoolManager(
+            num_pools=1,
+            maxsize=10,
+            timeout=30.0,
+            # 429 is not retried; urllib3 would honour any Retry-After uncapped, sleeping up to the Lambda timeout
+            retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                          raise_on_status=False)
+        )
+        self.headers = {
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'FreightlinerCI-PerformanceMonitor/1.0'
-        })
+        }
+        self.set_token(github_token)
+
+    def set_token(self, github_token: str):
+        """Authenticate subsequent requests with the given token"""
+        self.headers['Authorization'] = f'token {github_token}'
 
-    def get_workflow_runs(self, days_back: int = 30) -> List[Dict]:
+    def _get(self, url: str, fields: Optional[Dict[str, Any]] = None,
+             extra_headers: Optional[Dict[str, str]] = None) -> urllib3.BaseHTTPResponse:
+        """GET a GitHub API URL; transport failures and error statuses raise GitHubAPIError"""
+        headers = {**self.headers, **extra_headers} if extra_headers else self.headers
+        try:
+            response = self.http.request('GET', url, fields=fields, headers=headers)
+        except urllib3.exceptions.HTTPError as e:
+            raise GitHubAPIError(f"Request to {url} failed: {str(e)}") from e
+
+        if response.status >= 400:
+            raise GitHubAPIError(f"GitHub API returned HTTP {response.status} for {url}")
+        return response
+
+    def _get_runs_page(self, url: str, params: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """Fetch one page of workflow runs, keeping only RUN_FIELDS of each run"""
+        page_params = {**params, 'page': page}
+        cache_key = (url, tuple(sorted(page_params.items())))
+        cached = _etag_cache.get(cache_key)
+
+        headers = {'If-None-Match': cached[0]} if cached else None
+        response = self._get(url, fields=page_params, extra_headers=headers)
+        if cached and response.status == 304:
+            return cached[1]
+
+        data = json.loads(response.data)
+        data['workflow_runs'] = [
+            {field: run.get(field) for field in RUN_FIELDS}
+            for run in data.get('workflow_runs', [])
+        ]
+
+        etag = response.headers.get('ETag')
+        if etag:
+            _etag_cache[cache_key] = (etag, data)
+        return data
+
+    def get_workflow_runs(self, now: datetime, days_back: int = 30) -> List[Dict]:
         """Get workflow runs for performance analysis"""
         if not GITHUB_OWNER or not GITHUB_REPO:
             raise ConfigurationError("GitHub owner and repo must be configured")
 
         url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/actions/runs"
 
-        # Calculate date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days_back)
+        # Calculate date range; GitHub timestamps are UTC
+        start_date = now - timedelta(days=days_back)
 
-        all_runs = []
-        page = 1
-        max_pages = 10  # Limit to prevent excessive API calls
-
-        while len(all_runs) < 1000 and page <= max_pages:
-            params = {
-                'page': page,
-                'per_page': 100,
-                'status': 'completed',
-                'created': f'>{start_date.isoformat()}'
-            }
+        # Whole-hour lower bound keeps the query string stable between runs so ETags can match;
+        # the extra runs at the tail are trimmed while collecting
+        params = {
+            'per_page': RUNS_PER_PAGE,
+            'status': 'completed',
+            'exclude_pull_requests': 'true',
+            'created': f'>{start_date.strftime("%Y-%m-%dT%H:00:00Z")}'
+        }
 
-            try:
-                response = self.session.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
+        try:
+            first_page = self._get_runs_page(url, params, 1)
+        except (GitHubAPIError, ValueError) as e:
+            logger.error(f"Error fetching workflow runs (page 1): {str(e)}")
+            return []
 
-                runs = data.get('workflow_runs', [])
-                if not runs:
+        pages = [first_page.get('workflow_runs', [])]
+
+        # total_count on the first page tells how many pages remain, so fetch them concurrently
+        page_count = min(MAX_RUN_PAGES, math.ceil(first_page.get('total_count', 0) / RUNS_PER_PAGE))
+        if page_count > 1:
+            with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_PAGES, page_count - 1)) as executor:
+                futures = {
+                    page: executor.submit(self._get_runs_page, url, params, page)
+                    for page in range(2, page_count + 1)
+                }
+
+            # Collect in page order to keep runs newest-first
+            for page, future in futures.items():
+                try:
+                    pages.append(future.result().get('workflow_runs', []))
+                except (GitHubAPIError, ValueError) as e:
+                    logger.error(f"Error fetching workflow runs (page {page}): {str(e)}")
+
+        # Only this window's pages can be revalidated again; drop entries for earlier lower bounds
+        for cache_key in [key for key in _etag_cache if dict(key[1]).get('created') != params['created']]:
+            del _etag_cache[cache_key]
+
+        # Runs arrive newest-first, so stop at the first one older than the window. GitHub's
+        # fixed-width UTC timestamps order lexically, so the cut needs no parsing; the extractor
+        # parses each timestamp exactly once when it builds its columns
+        window_start = start_date.strftime('%Y-%m-%dT%H:%M:%SZ')
+        all_runs = []
+        window_exhausted = False
+        for page_runs in pages:
+            for run in page_runs:
+                created_at = run.get('created_at')
+                if not isinstance(created_at, str):
+                    logger.warning(f"Missing created_at in run {run.get('id')}")
+                    continue
+                if created_at < window_start:
+                    window_exhausted = True
                     break
-
-                all_runs.extend(runs)
-                page += 1
-
-                # Stop if we've gone beyond our date range
-                if runs:
-                    last_run_date = datetime.fromisoformat(runs[-1]['created_at'].replace('Z', '+00:00'))
-                    if last_run_date < start_date:
-                        break
-
-            except requests.RequestException as e:
-                logger.error(f"Error fetching workflow runs (page {page}): {str(e)}")
+                all_runs.append(run)
+            if window_exhausted:
                 break
 
-        # Filter by date range
-        filtered_runs = []
-        for run in all_runs:
-            try:
-                created_date = datetime.fromisoformat(run['created_at'].replace('Z', '+00:00'))
-                if start_date <= created_date <= end_date:
-                    filtered_runs.append(run)
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Invalid date format in run {run.get('id')}: {str(e)}")
-                continue
-
-        logger.info(f"Collected {len(filtered_runs)} workflow runs from last {days_back} days")
-        return filtered_runs
+        logger.info(f"Collected {len(all_runs)} workflow runs from last {days_back} days")
+        return all_runs
 
     def get_job_details(self, run_id: str) -> List[Dict]:
         """Get detailed job information for a workflow run"""
@@ -278,93 +406,124 @@ class GitHubMetricsCollector:
         url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/actions/runs/{run_id}/jobs"
 
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            data = json.loads(self._get(url).data)
             return data.get('jobs', [])
-        except requests.RequestException as e:
+        except (GitHubAPIError, ValueError) as e:
             logger.error(f"Error fetching job details for run {run_id}: {str(e)}")
             return []
 
 
+# Collector kept across warm invocations so its pooled GitHub connections are reused
+_collector: Optional[GitHubMetricsCollector] = None
+
+
+def get_collector(github_token: str) -> GitHubMetricsCollector:
+    """Return the container's GitHub collector, authenticated with the current token"""
+    global _collector
+    if _collector is None:
+        _collector = GitHubMetricsCollector(github_token)
+    else:
+        _collector.set_token(github_token)
+    return _collector
+
+
 class PerformanceMetricsExtractor:
     """Extracts performance metrics from workflow data"""
 
-    def extract_pipeline_metrics(self, workflow_runs: List[Dict]) -> Dict[str, List[float]]:
-        """Extract performance metrics from workflow runs"""
-        metrics = {
-            'total_duration': [],
-            'queue_time': [],
-            'success_rate_rolling': []
-        }
-
-        for i, run in enumerate(workflow_runs):
-            try:
-                # Calculate total duration
-                if run.get('created_at') and run.get('updated_at'):
-                    created = datetime.fromisoformat(run['created_at'].replace('Z', '+00:00'))
-                    updated = datetime.fromisoformat(run['updated_at'].replace('Z', '+00:00'))
-                    total_duration = (updated - created).total_seconds() / 60  # minutes
-                    if total_duration > 0:  # Validate positive duration
-                        metrics['total_duration'].append(total_duration)
-
-                # Calculate queue time
-                if run.get('created_at') and run.get('run_started_at'):
-                    created = datetime.fromisoformat(run['created_at'].replace('Z', '+00:00'))
-                    started = datetime.fromisoformat(run['run_started_at'].replace('Z', '+00:00'))
-                    queue_time = (started - created).total_seconds() / 60  # minutes
-                    if queue_time >= 0:  # Validate non-negative queue time
-                        metrics['queue_time'].append(queue_time)
-
-                # Calculate rolling success rate (last 10 runs)
-                window_start = max(0, i - 9)
-                window_runs = workflow_runs[window_start:i+1]
-                success_count = sum(1 for r in window_runs if r.get('conclusion') == 'success')
-                success_rate = success_count / len(window_runs) if window_runs else 0
-                metrics['success_rate_rolling'].append(success_rate)
-
-            except (ValueError, TypeError) as e:
-                logger.error(f"Error extracting metrics from run {run.get('id', 'unknown')}: {str(e)}")
-                continue
+    SUCCESS_RATE_WINDOW = 10
+
+    # Column-oriented view of the run fields the extractors read
+    RUN_COLUMNS = np.dtype([
+        ('created', 'datetime64[s]'),
+        ('updated', 'datetime64[s]'),
+        ('started', 'datetime64[s]'),
+        ('succeeded', np.float64)
+    ])
+
+    @staticmethod
+    def _to_datetime64(timestamps: List[Optional[str]]) -> np.ndarray:
+        """Parse GitHub UTC timestamps into a datetime64 column, NaT where missing or invalid"""
+        # numpy treats bare ISO strings as UTC; the trailing Z only triggers a deprecation warning
+        stripped = [ts[:-1] if ts and ts.endswith('Z') else (ts or 'NaT') for ts in timestamps]
+        try:
+            return np.array(stripped, dtype='datetime64[s]')
+        except ValueError:
+            column = np.full(len(stripped), np.datetime64('NaT'), dtype='datetime64[s]')
+            for i, ts in enumerate(stripped):
+                try:
+                    column[i] = np.datetime64(ts, 's')
+                except ValueError:
+                    logger.error(f"Invalid timestamp in workflow run: {ts}")
+            return column
+
+    def to_columns(self, workflow_runs: List[Dict]) -> np.ndarray:
+        """Convert workflow runs into a RUN_COLUMNS record array, parsing each field once"""
+        runs = np.empty(len(workflow_runs), dtype=self.RUN_COLUMNS)
+        runs['created'] = self._to_datetime64([run.get('created_at') for run in workflow_runs])
+        runs['updated'] = self._to_datetime64([run.get('updated_at') for run in workflow_runs])
+        runs['started'] = self._to_datetime64([run.get('run_started_at') for run in workflow_runs])
+        runs['succeeded'] = [run.get('conclusion') == 'success' for run in workflow_runs]
+        return runs
+
+    def extract_pipeline_metrics(self, runs: np.ndarray) -> Dict[str, np.ndarray]:
+        """Extract performance metrics from workflow run columns"""
+        if not runs.size:
+            return {'total_duration': np.empty(0), 'queue_time': np.empty(0), 'success_rate_rolling': np.empty(0)}
+
+        # Durations in minutes; NaT propagates to NaN and fails both comparisons below
+        total_duration = (runs['updated'] - runs['created']) / np.timedelta64(60, 's')
+        queue_time = (runs['started'] - runs['created']) / np.timedelta64(60, 's')
+
+        # Rolling success rate over the trailing window (shorter for the first runs)
+        window = self.SUCCESS_RATE_WINDOW
+        # Running sum: each window total is the prefix sum minus the prefix sum `window` runs earlier
+        running = np.cumsum(runs['succeeded'])
+        window_sums = running.copy()
+        window_sums[window:] -= running[:-window]
+        window_sizes = np.minimum(np.arange(1, runs.size + 1), window)
 
-        return metrics
+        return {
+            'total_duration': total_duration[total_duration > 0],  # Validate positive duration
+            'queue_time': queue_time[queue_time >= 0],  # Validate non-negative queue time
+            'success_rate_rolling': window_sums / window_sizes
+        }
 
-    def extract_resource_utilization(self, workflow_runs: List[Dict]) -> Dict[str, List[float]]:
+    def extract_resource_utilization(self, runs: np.ndarray) -> Dict[str, np.ndarray]:
         """Extract resource utilization metrics"""
         metrics = {
-            'concurrent_jobs': []
+            'concurrent_jobs': np.empty(0)
         }
 
-        time_buckets = {}
-        for run in workflow_runs:
-            if not (run.get('created_at') and run.get('updated_at')):
-                continue
+        timed = runs[~np.isnat(runs['created']) & ~np.isnat(runs['updated'])]
+        if not timed.size:
+            return metrics
 
-            try:
-                created = datetime.fromisoformat(run['created_at'].replace('Z', '+00:00'))
-                updated = datetime.fromisoformat(run['updated_at'].replace('Z', '+00:00'))
+        starts = timed['created'].astype(np.int64)
+        ends = np.maximum(timed['updated'].astype(np.int64), starts)
 
-                # Bucket by hour for concurrent job analysis
-                hour_bucket = created.replace(minute=0, second=0, microsecond=0)
-                if hour_bucket not in time_buckets:
-                    time_buckets[hour_bucket] = []
-                time_buckets[hour_bucket].append((created, updated))
+        # Bucket by hour for concurrent job analysis, keeping hours in order of first appearance
+        _, first_seen, bucket_of = np.unique(
+            timed['created'].astype('datetime64[h]'), return_index=True, return_inverse=True
+        )
 
-            except (ValueError, TypeError) as e:
-                logger.error(f"Error processing run timing: {str(e)}")
-                continue
+        # Two-pointer count over sorted starts and ends of all hours at once. Each run is keyed by
+        # hour * span + offset, with span wider than any start-to-end distance, so every hour owns
+        # a disjoint key range and hours need no separate passes
+        span = int(ends.max() - starts.min()) + 1
+        hour_base = bucket_of.astype(np.int64) * span - starts.min()
+        start_keys = np.sort(hour_base + starts)
+        end_keys = np.sort(hour_base + ends)
 
-        # Calculate concurrent jobs per hour
-        for hour, runs in time_buckets.items():
-            max_concurrent = 0
-            for i, (start1, end1) in enumerate(runs):
-                concurrent = 1  # Count the current run
-                for j, (start2, end2) in enumerate(runs):
-                    if i != j and start2 <= end1 and start1 <= end2:
-                        concurrent += 1
-                max_concurrent = max(max_concurrent, concurrent)
+        # Runs open at each start: starts at or before it minus ends strictly before it, so runs
+        # that touch still count as overlapping. Earlier hours contribute equally to both counts
+        open_runs = (np.searchsorted(start_keys, start_keys, side='right')
+                     - np.searchsorted(end_keys, start_keys, side='left'))
 
-            metrics['concurrent_jobs'].append(max_concurrent)
+        # The count only rises at a start, so each hour's peak is the max over its starts
+        bucket_offsets = np.concatenate(([0], np.cumsum(np.bincount(bucket_of))[:-1]))
+        peak_per_bucket = np.maximum.reduceat(open_runs, bucket_offsets)
+
+        metrics['concurrent_jobs'] = peak_per_bucket[np.argsort(first_seen)].astype(np.float64)
 
         return metrics
 
@@ -374,7 +533,12 @@ def load_baselines_from_s3() -> Dict[str, PerformanceBaseline]:
     try:
         key = "performance-baselines/current-baselines.json"
         response = s3.get_object(Bucket=S3_BUCKET, Key=key)
-        data = json.loads(response['Body'].read())
+        # Decompress while reading from the response stream instead of buffering the
+        # compressed object first; baselines written before compression are plain JSON
+        body = response['Body']
+        if response.get('ContentEncoding') == 'gzip':
+            body = gzip.GzipFile(fileobj=body)
+        data = json.load(body)
 
         baselines = {}
         for metric_name, baseline_data in data.items():
@@ -399,13 +563,46 @@ def load_baselines_from_s3() -> Dict[str, PerformanceBaseline]:
         else:
             logger.error(f"Error loading baselines from S3: {str(e)}")
             return {}
-    except (json.JSONDecodeError, KeyError, ValueError) as e:
+    except (json.JSONDecodeError, gzip.BadGzipFile, KeyError, ValueError) as e:
         logger.error(f"Error parsing baseline data: {str(e)}")
         return {}
 
 
-def save_baselines_to_s3(baselines: Dict[str, PerformanceBaseline]):
+def load_etag_cache():
+    """Restore the GitHub ETag cache from S3 into _etag_cache"""
+    try:
+        response = s3.get_object(Bucket=S3_BUCKET, Key=ETAG_CACHE_KEY)
+        entries = json.load(gzip.GzipFile(fileobj=response['Body']))
+        for url, params, etag, page in entries:
+            _etag_cache[(url, tuple(tuple(param) for param in params))] = (etag, page)
+        logger.info(f"Loaded {len(entries)} cached GitHub ETags from S3")
+
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'NoSuchKey':
+            logger.error(f"Error loading GitHub ETag cache from S3: {str(e)}")
+    except (json.JSONDecodeError, gzip.BadGzipFile, TypeError, ValueError) as e:
+        logger.error(f"Error parsing GitHub ETag cache: {str(e)}")
+
+
+def save_etag_cache():
+    """Persist _etag_cache to S3"""
+    entries = [[url, list(params), etag, page] for (url, params), (etag, page) in _etag_cache.items()]
+    try:
+        s3.put_object(
+            Bucket=S3_BUCKET,
+            Key=ETAG_CACHE_KEY,
+            Body=gzip.compress(json.dumps(entries, separators=(',', ':')).encode('utf-8'), compresslevel=6),
+            ContentType='application/json',
+            ContentEncoding='gzip',
+            ServerSideEncryption='aws:kms'
+        )
+    except ClientError as e:
+        logger.error(f"Error saving GitHub ETag cache to S3: {str(e)}")
+
+
+def save_baselines_to_s3(baselines: Dict[str, PerformanceBaseline], now: Optional[datetime] = None):
     """Save performance baselines to S3"""
+    now = now or datetime.now(timezone.utc)
     try:
         baseline_data = {}
         for metric_name, baseline in baselines.items():
@@ -419,22 +616,29 @@ def save_baselines_to_s3(baselines: Dict[str, PerformanceBaseline]):
                 'confidence_interval': list(baseline.confidence_interval)
             }
 
+        # Serialize and compress once
+        body = gzip.compress(
+            json.dumps(baseline_data, separators=(',', ':'), default=str).encode('utf-8'),
+            compresslevel=6
+        )
+
         key = "performance-baselines/current-baselines.json"
         s3.put_object(
             Bucket=S3_BUCKET,
             Key=key,
-            Body=json.dumps(baseline_data, default=str),
+            Body=body,
             ContentType='application/json',
+            ContentEncoding='gzip',
             ServerSideEncryption='aws:kms'
         )
 
-        # Also save a timestamped backup
-        backup_key = f"performance-baselines/backups/baselines-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
-        s3.put_object(
+        # Also save a timestamped backup; a server-side copy avoids uploading the body twice
+        backup_key = f"performance-baselines/backups/baselines-{now.strftime('%Y%m%d-%H%M%S')}.json"
+        s3.copy_object(
             Bucket=S3_BUCKET,
             Key=backup_key,
-            Body=json.dumps(baseline_data, default=str),
-            ContentType='application/json',
+            CopySource={'Bucket': S3_BUCKET, 'Key': key},
+            MetadataDirective='COPY',
             ServerSideEncryption='aws:kms'
         )
 
@@ -444,36 +648,40 @@ def save_baselines_to_s3(baselines: Dict[str, PerformanceBaseline]):
         logger.error(f"Error saving baselines to S3: {str(e)}")
 
 
-def publish_performance_metrics(metrics: Dict[str, List[float]], baselines: Dict[str, PerformanceBaseline]):
+def publish_performance_metrics(metrics: Dict[str, np.ndarray], baselines: Dict[str, PerformanceBaseline],
+                                now: datetime):
     """Publish performance metrics to CloudWatch"""
-    timestamp = datetime.now()
     metric_data = []
 
     for metric_name, values in metrics.items():
-        if not values:
+        if len(values) == 0:
             continue
 
-        current_value = values[-1] if values else 0  # Most recent value
-        avg_value = statistics.mean(values) if values else 0
+        current_value = float(values[-1])  # Most recent value
 
         # Current value metric
         metric_data.append({
             'MetricName': f'{metric_name}_current',
             'Value': current_value,
             'Unit': 'None',
-            'Timestamp': timestamp,
+            'Timestamp': now,
             'Dimensions': [
                 {'Name': 'Repository', 'Value': f"{GITHUB_OWNER}/{GITHUB_REPO}"},
                 {'Name': 'MetricType', 'Value': 'performance'}
             ]
         })
 
-        # Average value metric
+        # Average value metric, sent as a statistic set so CloudWatch also keeps min/max/count
         metric_data.append({
             'MetricName': f'{metric_name}_average',
-            'Value': avg_value,
+            'StatisticValues': {
+                'SampleCount': float(len(values)),
+                'Sum': float(values.sum()),
+                'Minimum': float(values.min()),
+                'Maximum': float(values.max())
+            },
             'Unit': 'None',
-            'Timestamp': timestamp,
+            'Timestamp': now,
             'Dimensions': [
                 {'Name': 'Repository', 'Value': f"{GITHUB_OWNER}/{GITHUB_REPO}"},
                 {'Name': 'MetricType', 'Value': 'performance'}
@@ -489,24 +697,27 @@ def publish_performance_metrics(metrics: Dict[str, List[float]], baselines: Dict
                 'MetricName': f'{metric_name}_baseline_deviation',
                 'Value': deviation_percent,
                 'Unit': 'Percent',
-                'Timestamp': timestamp,
+                'Timestamp': now,
                 'Dimensions': [
                     {'Name': 'Repository', 'Value': f"{GITHUB_OWNER}/{GITHUB_REPO}"},
                     {'Name': 'MetricType', 'Value': 'baseline_comparison'}
                 ]
             })
 
-    # Publish metrics in batches
+    # Publish metrics in batches, concurrently; the boto3 client is thread-safe
     batch_size = 20
-    for i in range(0, len(metric_data), batch_size):
-        batch = metric_data[i:i + batch_size]
-        try:
-            cloudwatch.put_metric_data(
-                Namespace=CLOUDWATCH_NAMESPACE,
-                MetricData=batch
-            )
-        except ClientError as e:
-            logger.error(f"Error publishing metrics batch: {str(e)}")
+    batches = [metric_data[i:i + batch_size] for i in range(0, len(metric_data), batch_size)]
+    if batches:
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_PUTS, len(batches))) as executor:
+            futures = [
+                executor.submit(cloudwatch.put_metric_data, Namespace=CLOUDWATCH_NAMESPACE, MetricData=batch)
+                for batch in batches
+            ]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except ClientError as e:
+                    logger.error(f"Error publishing metrics batch: {str(e)}")
 
     logger.info(f"Published {len(metric_data)} performance metrics to CloudWatch")
 
@@ -532,6 +743,9 @@ def handler(event, context):
     """Lambda handler for performance monitoring"""
     logger.info("Starting performance monitoring")
 
+    # Single timestamp for the run window, baselines, backups and metrics of this invocation
+    now = datetime.now(timezone.utc)
+
     try:
         # Validate environment configuration
         validate_environment()
@@ -540,12 +754,20 @@ def handler(event, context):
         github_token = get_github_token()
 
         # Initialize components
-        collector = GitHubMetricsCollector(github_token)
+        collector = get_collector(github_token)
         extractor = PerformanceMetricsExtractor()
         analyzer = PerformanceAnalyzer()
 
         # Collect workflow data
-        workflow_runs = collector.get_workflow_runs(days_back=30)
+        # Restore ETags on a cold start so unchanged run pages still come back as 304s
+        if not _etag_cache:
+            load_etag_cache()
+        etags_before = {key: etag for key, (etag, _) in _etag_cache.items()}
+
+        workflow_runs = collector.get_workflow_runs(now, days_back=30)
+
+        if {key: etag for key, (etag, _) in _etag_cache.items()} != etags_before:
+            save_etag_cache()
         if not workflow_runs:
             logger.warning("No workflow runs found for analysis")
             return {
@@ -554,8 +776,9 @@ def handler(event, context):
             }
 
         # Extract performance metrics
-        pipeline_metrics = extractor.extract_pipeline_metrics(workflow_runs)
-        resource_metrics = extractor.extract_resource_utilization(workflow_runs)
+        run_columns = extractor.to_columns(workflow_runs)
+        pipeline_metrics = extractor.extract_pipeline_metrics(run_columns)
+        resource_metrics = extractor.extract_resource_utilization(run_columns)
 
         # Combine all metrics
         all_metrics = {**pipeline_metrics, **resource_metrics}
@@ -563,33 +786,30 @@ def handler(event, context):
         # Load existing baselines
         baselines = load_baselines_from_s3()
 
-        # Update baselines and detect regressions
+        # Update baselines
         updated_baselines = {}
-        regressions = []
 
         for metric_name, values in all_metrics.items():
-            if not values:
+            if len(values) == 0:
                 continue
 
             # Calculate new baseline
-            new_baseline = analyzer.calculate_baseline(values)
+            new_baseline = analyzer.calculate_baseline(metric_name, values, now)
             if new_baseline:
-                new_baseline.metric_name = metric_name
                 updated_baselines[metric_name] = new_baseline
 
-                # Check for regression using old baseline
-                if metric_name in baselines:
-                    current_value = values[-1]  # Most recent value
-                    regression = analyzer.detect_regression(current_value, baselines[metric_name])
-                    if regression:
-                        regressions.append(regression)
+        # Check the most recent values for regression against the old baselines
+        regressions = analyzer.detect_regressions(
+            {metric_name: all_metrics[metric_name][-1] for metric_name in updated_baselines},
+            baselines
+        )
 
         # Save updated baselines
         if updated_baselines:
-            save_baselines_to_s3(updated_baselines)
+            save_baselines_to_s3(updated_baselines, now)
 
         # Publish metrics to CloudWatch
-        publish_performance_metrics(all_metrics, updated_baselines)
+        publish_performance_metrics(all_metrics, updated_baselines, now)
 
         # Send regression alerts
         send_regression_alerts(regressions)
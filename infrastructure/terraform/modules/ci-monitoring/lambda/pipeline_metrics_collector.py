@@ -4,25 +4,53 @@ Collects metrics from GitHub Actions and publishes to CloudWatch
 """
 
 import json
+import gzip
 import boto3
 import os
+import math
+import time
 import logging
-from datetime import datetime, timedelta
+import functools
+import threading
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from typing import Dict, List, Any, Optional
+from dataclasses import dataclass, field
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from botocore.config import Config
 from botocore.exceptions import ClientError
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Configure logging
 logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
 logger = logging.getLogger(__name__)
 
-# AWS clients
-cloudwatch = boto3.client('cloudwatch')
-dynamodb = boto3.resource('dynamodb')
-s3 = boto3.client('s3')
-sns = boto3.client('sns')
-secrets_manager = boto3.client('secretsmanager')
+# AWS clients; botocore's adaptive mode handles backoff and throttling for every AWS call,
+# keep-alive sockets survive between warm invocations and the pool covers the concurrent writers
+BOTO_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    connect_timeout=3,
+    read_timeout=10
+)
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+secrets_manager = boto3.client('secretsmanager', config=BOTO_CONFIG)
+
+# Clients only needed once metrics exist are created on first use, so invocations that
+# exit early (bad config, open circuit breaker) skip their setup; numpy is deferred the
+# same way and imported by the metric calculation
+CLIENT_CONFIGS = {
+    # PutMetricData bodies repeat the same dimensions for every datum and gzip well
+    'cloudwatch': BOTO_CONFIG.merge(Config(request_min_compression_size_bytes=1024)),
+    's3': BOTO_CONFIG,
+    'sns': BOTO_CONFIG
+}
+_clients = {}
+_clients_lock = threading.Lock()
 
 # Configuration
 GITHUB_SECRET_ARN = os.getenv('GITHUB_SECRET_ARN')
@@ -32,18 +60,103 @@ DYNAMODB_TABLE = os.getenv('DYNAMODB_TABLE')
 S3_BUCKET = os.getenv('S3_BUCKET')
 SNS_CRITICAL_TOPIC = os.getenv('SNS_CRITICAL_TOPIC')
 SNS_WARNING_TOPIC = os.getenv('SNS_WARNING_TOPIC')
+GITHUB_TOKEN_TTL = int(os.getenv('GITHUB_TOKEN_TTL', '3300'))  # Seconds a warm container reuses the token
+ENVIRONMENT = os.getenv('ENVIRONMENT', 'unknown')
+
+# Per-repository values derived once at import
+REPOSITORY = f"{GITHUB_OWNER}/{GITHUB_REPO}"
+WORKFLOW_RUNS_URL = f"https://api.github.com/repos/{REPOSITORY}/actions/runs"
+METRIC_DIMENSIONS = [
+    {'Name': 'Repository', 'Value': REPOSITORY},
+    {'Name': 'Environment', 'Value': ENVIRONMENT}
+]
+
+# CloudWatch metrics published per collection: (metric name, metrics key, unit, scale)
+METRIC_SPEC = (
+    ('PipelineSuccessRate', 'success_rate', 'Percent', 100),
+    ('PipelineFailureRate', 'failure_rate', 'Percent', 100),
+    ('AveragePipelineDuration', 'avg_duration_minutes', 'None', 1),
+    ('TotalPipelineRuns', 'total_runs', 'Count', 1),
+    ('LongRunningPipelines', 'long_running_pipelines', 'Count', 1)
+)
 
 # Thresholds from environment variables with defaults
 SUCCESS_RATE_THRESHOLD = float(os.getenv('SUCCESS_RATE_THRESHOLD', '0.95'))
 DURATION_THRESHOLD_MINUTES = int(os.getenv('DURATION_THRESHOLD', '30'))
 FAILURE_RATE_THRESHOLD = float(os.getenv('FAILURE_RATE_THRESHOLD', '0.15'))
 
-# Circuit breaker state
-circuit_breaker_state = {
-    'failures': 0,
-    'last_failure': None,
-    'state': 'CLOSED'  # CLOSED, OPEN, HALF_OPEN
-}
+# GitHub pagination; one page keeps the metrics window at the latest 100 runs
+RUNS_PER_PAGE = 100
+MIN_RUNS_PER_PAGE = 25
+MAX_RUN_PAGES = int(os.getenv('MAX_RUN_PAGES', '1'))
+RUN_WINDOW_SIZE = RUNS_PER_PAGE * MAX_RUN_PAGES
+MAX_CONCURRENT_PAGES = 5
+# Incremental polling: only runs created since the oldest run in the stored window are fetched and
+# merged into it, so runs that were queued or in progress at the last poll are picked up once they
+# complete however long they took
+RUN_FIELDS = ('id', 'conclusion', 'created_at', 'updated_at')
+# DynamoDB sort key of the item holding the last GitHub ETag, run window and metrics
+POLL_STATE_EXECUTION_ID = 'github-etag'
+# Last poll state, kept in memory so warm invocations skip the DynamoDB read
+_poll_state: Dict[str, Any] = {}
+# GitHub rate limiting: wait out short resets, fail fast on long ones, and stop early
+# once the shared token's quota is nearly spent
+RATE_LIMIT_MAX_WAIT = 60  # Longest sleep for a rate limit reset within one invocation
+RATE_LIMIT_LOW_WATERMARK = 5
+_rate_limit = {'reset_at': 0.0}  # Epoch seconds until which no further calls are made
+
+# Page size in use; halved after a GitHub timeout and grown back as requests succeed
+_page_size = RUNS_PER_PAGE
+
+# GitHub token fetched from Secrets Manager, reused until it expires
+_token_cache = {'value': None, 'expires_at': 0.0}
+
+# GitHub HTTP session, reused across warm invocations so connections stay alive
+github_session = requests.Session()
+github_session.headers.update({
+    'Accept': 'application/vnd.github.v3+json',
+    'User-Agent': 'FreightlinerCI-MetricsCollector/1.0'
+})
+github_session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=1,
+        backoff_jitter=1.0,  # Keeps collectors that fail together from retrying in lockstep
+        backoff_max=30,
+        # 429 is handled with the rate limit headers; urllib3 would honour any Retry-After uncapped
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=['GET'],
+        read=False,  # Surface read timeouts so the next request uses a smaller page
+        raise_on_status=False
+    )
+))
+
+# Circuit breaker settings
+CIRCUIT_BREAKER_FAILURE_LIMIT = 5
+CIRCUIT_BREAKER_RESET_SECONDS = 300
+
+
+@dataclass
+class CircuitBreakerState:
+    """Circuit breaker state for one external call, shared by its concurrent invocations"""
+    failures: int = 0
+    last_failure: Optional[float] = None  # time.monotonic() of the latest failure
+    state: str = 'CLOSED'  # CLOSED, OPEN, HALF_OPEN
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Consistent copy of the state for reports, with the last failure as wall-clock time"""
+        with self.lock:
+            last_failure = None
+            if self.last_failure is not None:
+                last_failure = datetime.now() - timedelta(seconds=time.monotonic() - self.last_failure)
+            return {'failures': self.failures, 'last_failure': last_failure, 'state': self.state}
+
+
+# One breaker per decorated call, so a failing endpoint does not block the others
+circuit_breakers: Dict[str, CircuitBreakerState] = {}
 
 
 class ConfigurationError(Exception):
@@ -56,6 +169,15 @@ class GitHubAPIError(Exception):
     pass
 
 
+def get_client(service_name: str):
+    """Return the shared boto3 client for a service, creating it on first use"""
+    # boto3 client creation is not thread-safe and the writers run concurrently
+    with _clients_lock:
+        if service_name not in _clients:
+            _clients[service_name] = boto3.client(service_name, config=CLIENT_CONFIGS[service_name])
+        return _clients[service_name]
+
+
 def validate_environment():
     """Validate required environment variables"""
     required_vars = {
@@ -77,7 +199,10 @@ def validate_environment():
 
 
 def get_github_token() -> str:
-    """Retrieve GitHub token from AWS Secrets Manager"""
+    """Retrieve GitHub token from AWS Secrets Manager, reusing it for GITHUB_TOKEN_TTL seconds"""
+    if _token_cache['value'] and time.monotonic() < _token_cache['expires_at']:
+        return _token_cache['value']
+
     try:
         response = secrets_manager.get_secret_value(SecretId=GITHUB_SECRET_ARN)
 
@@ -88,6 +213,8 @@ def get_github_token() -> str:
             if not token:
                 raise ConfigurationError("GitHub token not found in secret")
 
+            _token_cache['value'] = token
+            _token_cache['expires_at'] = time.monotonic() + GITHUB_TOKEN_TTL
             return token
         else:
             raise ConfigurationError("Secret does not contain string data")
@@ -98,6 +225,10 @@ def get_github_token() -> str:
             raise ConfigurationError(f"Secret not found: {GITHUB_SECRET_ARN}")
         elif error_code == 'AccessDeniedException':
             raise ConfigurationError(f"Access denied to secret: {GITHUB_SECRET_ARN}")
+        elif _token_cache['value']:
+            # Transient Secrets Manager failure; the expired token is most likely still valid
+            logger.warning(f"Error refreshing secret, reusing cached GitHub token: {str(e)}")
+            return _token_cache['value']
         else:
             raise ConfigurationError(f"Error retrieving secret: {str(e)}")
 
@@ -125,91 +256,207 @@ def validate_event_input(event: Dict[str, Any]) -> bool:
 
 def circuit_breaker(func):
     """Circuit breaker decorator for external API calls"""
+    breaker = circuit_breakers.setdefault(func.__name__, CircuitBreakerState())
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        global circuit_breaker_state
-
-        if circuit_breaker_state['state'] == 'OPEN':
-            # Check if we should try half-open
-            if (circuit_breaker_state['last_failure'] and
-                datetime.now() - circuit_breaker_state['last_failure'] > timedelta(minutes=5)):
-                circuit_breaker_state['state'] = 'HALF_OPEN'
-                logger.info("Circuit breaker moved to HALF_OPEN state")
-            else:
-                logger.warning("Circuit breaker is OPEN, skipping external call")
-                return None
+        with breaker.lock:
+            if breaker.state == 'OPEN':
+                # Check if we should try half-open
+                if (breaker.last_failure is not None and
+                        time.monotonic() - breaker.last_failure > CIRCUIT_BREAKER_RESET_SECONDS):
+                    breaker.state = 'HALF_OPEN'
+                    logger.info(f"Circuit breaker for {func.__name__} moved to HALF_OPEN state")
+                else:
+                    logger.warning(f"Circuit breaker for {func.__name__} is OPEN, skipping external call")
+                    return None
 
         try:
             result = func(*args, **kwargs)
-            # Success - reset circuit breaker
-            if circuit_breaker_state['state'] == 'HALF_OPEN':
-                circuit_breaker_state['state'] = 'CLOSED'
-                circuit_breaker_state['failures'] = 0
-                logger.info("Circuit breaker moved to CLOSED state")
-            return result
-
         except requests.RequestException as e:
-            circuit_breaker_state['failures'] += 1
-            circuit_breaker_state['last_failure'] = datetime.now()
+            with breaker.lock:
+                breaker.failures += 1
+                breaker.last_failure = time.monotonic()
 
-            if circuit_breaker_state['failures'] >= 5:
-                circuit_breaker_state['state'] = 'OPEN'
-                logger.error(f"Circuit breaker opened due to {circuit_breaker_state['failures']} failures")
+                if breaker.failures >= CIRCUIT_BREAKER_FAILURE_LIMIT:
+                    breaker.state = 'OPEN'
+                    logger.error(f"Circuit breaker for {func.__name__} opened due to {breaker.failures} failures")
 
-            logger.error(f"Circuit breaker recorded failure: {str(e)}")
+            logger.error(f"Circuit breaker for {func.__name__} recorded failure: {str(e)}")
             raise GitHubAPIError(f"GitHub API request failed: {str(e)}")
 
+        # Success - reset circuit breaker
+        with breaker.lock:
+            if breaker.state == 'HALF_OPEN':
+                breaker.state = 'CLOSED'
+                breaker.failures = 0
+                logger.info(f"Circuit breaker for {func.__name__} moved to CLOSED state")
+        return result
+
     return wrapper
 
 
+def _parse_rate_limit_reset(value: Optional[str]) -> Optional[float]:
+    """Parse an X-RateLimit-Reset epoch header, None if missing or malformed"""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _rate_limit_wait(response: requests.Response) -> Optional[float]:
+    """Seconds until GitHub lifts the rate limit reported by a response, None if not rate limited"""
+    retry_after = response.headers.get('Retry-After')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        # Retry-After may also be an HTTP-date
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed Retry-After header: {retry_after}")
+    if response.headers.get('X-RateLimit-Remaining') == '0':
+        reset_at = _parse_rate_limit_reset(response.headers.get('X-RateLimit-Reset'))
+        return max(0.0, reset_at - time.time()) if reset_at is not None else None
+    return None
+
+
+def _record_rate_limit(response: requests.Response):
+    """Stop calling GitHub until the quota resets once it is nearly exhausted"""
+    remaining = response.headers.get('X-RateLimit-Remaining')
+    reset_at = _parse_rate_limit_reset(response.headers.get('X-RateLimit-Reset'))
+    if remaining and remaining.isdigit() and int(remaining) < RATE_LIMIT_LOW_WATERMARK and reset_at is not None:
+        _rate_limit['reset_at'] = reset_at
+        logger.warning(f"GitHub API quota nearly exhausted ({remaining} requests left)")
+
+
 @circuit_breaker
-def get_github_workflow_runs(token: str, page: int = 1, per_page: int = 100) -> Optional[Dict]:
+def get_github_workflow_runs(token: str, page: int = 1, per_page: int = RUNS_PER_PAGE,
+                             etag: Optional[str] = None, created_since: Optional[str] = None) -> Optional[Dict]:
     """Fetch workflow runs from GitHub API with circuit breaker"""
+    global _page_size
+
     if not GITHUB_OWNER or not GITHUB_REPO:
         raise ConfigurationError("GitHub owner and repo must be configured")
 
-    url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/actions/runs"
-    headers = {
-        'Authorization': f'token {token}',
-        'Accept': 'application/vnd.github.v3+json',
-        'User-Agent': 'FreightlinerCI-MetricsCollector/1.0'
-    }
+    headers = {'Authorization': f'token {token}'}
+    if etag:
+        headers['If-None-Match'] = etag
     params = {
         'page': page,
         'per_page': min(per_page, 100),  # Enforce max page size
-        'status': 'completed'
+        'status': 'completed',
+        # The metrics never read the pull request list, which is the bulk of each run object
+        'exclude_pull_requests': 'true'
     }
+    if created_since:
+        params['created'] = f">={created_since}"
+
+    wait = _rate_limit['reset_at'] - time.time()
+    if wait > RATE_LIMIT_MAX_WAIT:
+        reset_at = datetime.fromtimestamp(_rate_limit['reset_at']).isoformat()
+        raise GitHubAPIError(f"GitHub API rate limit exhausted until {reset_at}")
+    elif wait > 0:
+        time.sleep(min(wait, RATE_LIMIT_MAX_WAIT) + 1)
 
     logger.info(f"Fetching workflow runs from GitHub API (page {page})")
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        for attempt in range(2):
+            response = github_session.get(WORKFLOW_RUNS_URL, headers=headers, params=params, timeout=30)
+            wait = _rate_limit_wait(response) if response.status_code in (403, 429) else None
+            # Retry once after a short reset; longer waits fail fast below
+            if wait is None or attempt or wait > RATE_LIMIT_MAX_WAIT:
+                break
+            logger.warning(f"GitHub API rate limited, retrying in {wait + 1:.0f} seconds")
+            time.sleep(min(wait, RATE_LIMIT_MAX_WAIT) + 1)
+
+        _record_rate_limit(response)
+        if response.status_code < 400:
+            _page_size = min(RUNS_PER_PAGE, _page_size * 2)
+        if response.status_code == 304:
+            # Unchanged since the last poll; 304s do not count against the rate limit
+            return {'not_modified': True, 'etag': etag}
         response.raise_for_status()
-        return response.json()
+        workflow_data = response.json()
+        workflow_data['etag'] = response.headers.get('ETag')
+        return workflow_data
     except requests.Timeout:
+        # Large pages of completed runs are slow to render on busy repositories
+        _page_size = max(MIN_RUNS_PER_PAGE, min(per_page, 100) // 2)
         raise GitHubAPIError("GitHub API request timed out")
     except requests.HTTPError as e:
         if response.status_code == 401:
+            # Drop the cached token so the next invocation picks up a rotated secret
+            _token_cache['value'] = None
             raise GitHubAPIError("GitHub authentication failed - check token")
-        elif response.status_code == 403:
-            raise GitHubAPIError("GitHub API rate limit exceeded")
+        elif response.status_code in (403, 429):
+            if wait is not None:
+                reset_at = datetime.fromtimestamp(time.time() + wait).isoformat()
+                raise GitHubAPIError(f"GitHub API rate limit exceeded until {reset_at}")
+            raise GitHubAPIError("GitHub API access forbidden - check token permissions")
         elif response.status_code == 404:
-            raise GitHubAPIError(f"Repository not found: {GITHUB_OWNER}/{GITHUB_REPO}")
+            raise GitHubAPIError(f"Repository not found: {REPOSITORY}")
         else:
             raise GitHubAPIError(f"GitHub API returned {response.status_code}: {str(e)}")
 
 
-def retry_with_backoff(func, max_retries: int = 3, base_delay: float = 1.0):
-    """Retry function with exponential backoff"""
-    for attempt in range(max_retries):
-        try:
-            return func()
-        except (ClientError, GitHubAPIError) as e:
-            if attempt == max_retries - 1:
-                raise
+# The workflow runs breaker is the one reported in alerts, snapshots and responses
+circuit_breaker_state = circuit_breakers['get_github_workflow_runs']
+
+
+def fetch_workflow_runs(token: str, etag: Optional[str] = None, created_since: Optional[str] = None) -> Optional[Dict]:
+    """Fetch recent workflow runs, requesting any pages after the first concurrently"""
+    per_page = _page_size
+    first_page = get_github_workflow_runs(token, per_page=per_page, etag=etag, created_since=created_since)
+    if not first_page or first_page.get('not_modified'):
+        return first_page
+
+    workflow_runs = first_page.get('workflow_runs', [])
+    page_count = math.ceil(min(RUN_WINDOW_SIZE, first_page.get('total_count', 0)) / per_page)
+    if page_count > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_PAGES, page_count - 1)) as executor:
+            # map() preserves page order, keeping the runs newest-first
+            pages = executor.map(
+                lambda page: get_github_workflow_runs(token, page=page, per_page=per_page, created_since=created_since),
+                range(2, page_count + 1)
+            )
+            for page_data in pages:
+                if page_data:
+                    workflow_runs.extend(page_data.get('workflow_runs', []))
+
+    return {'workflow_runs': workflow_runs, 'etag': first_page.get('etag')}
+
 
-            delay = base_delay * (2 ** attempt)
-            logger.warning(f"Attempt {attempt + 1} failed: {str(e)}. Retrying in {delay} seconds...")
-            time.sleep(delay)
+def merge_workflow_runs(window: List[Dict], new_runs: List[Dict], limit: int) -> List[Dict]:
+    """Merge newly fetched runs into the stored window, keeping the newest `limit` runs"""
+    merged = {run['id']: run for run in window}
+    for run in new_runs:
+        merged[run['id']] = {name: run.get(name) for name in RUN_FIELDS}
+    return sorted(merged.values(), key=lambda run: run.get('created_at') or '', reverse=True)[:limit]
+
+
+def _to_datetime64(timestamps: List[Optional[str]]) -> 'np.ndarray':
+    """Parse GitHub UTC timestamps into a datetime64 array, NaT where missing or invalid"""
+    import numpy as np
+
+    # numpy treats bare ISO strings as UTC; the trailing Z only triggers a deprecation warning
+    stripped = [ts[:-1] if ts and ts.endswith('Z') else (ts or 'NaT') for ts in timestamps]
+    try:
+        return np.array(stripped, dtype='datetime64[s]')
+    except ValueError:
+        parsed = np.full(len(stripped), np.datetime64('NaT'), dtype='datetime64[s]')
+        for i, ts in enumerate(stripped):
+            try:
+                parsed[i] = np.datetime64(ts, 's')
+            except ValueError:
+                logger.warning(f"Invalid timestamp format in workflow run: {ts}")
+        return parsed
 
 
 def calculate_pipeline_metrics(workflow_runs: List[Dict]) -> Dict[str, Any]:
@@ -218,34 +465,28 @@ def calculate_pipeline_metrics(workflow_runs: List[Dict]) -> Dict[str, Any]:
         return {}
 
     total_runs = len(workflow_runs)
-    successful_runs = sum(1 for run in workflow_runs if run.get('conclusion') == 'success')
-    failed_runs = sum(1 for run in workflow_runs if run.get('conclusion') == 'failure')
-    cancelled_runs = sum(1 for run in workflow_runs if run.get('conclusion') == 'cancelled')
-
-    # Calculate durations
-    durations = []
-    for run in workflow_runs:
-        try:
-            if run.get('created_at') and run.get('updated_at'):
-                created = datetime.fromisoformat(run['created_at'].replace('Z', '+00:00'))
-                updated = datetime.fromisoformat(run['updated_at'].replace('Z', '+00:00'))
-                duration_minutes = (updated - created).total_seconds() / 60
-                if duration_minutes > 0:  # Validate positive duration
-                    durations.append(duration_minutes)
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Invalid timestamp format in run {run.get('id')}: {str(e)}")
-            continue
-
-    avg_duration = sum(durations) / len(durations) if durations else 0
-    max_duration = max(durations) if durations else 0
-    min_duration = min(durations) if durations else 0
+    # list.count scans in C without building a string array
+    conclusions = [run.get('conclusion') for run in workflow_runs]
+    successful_runs = conclusions.count('success')
+    failed_runs = conclusions.count('failure')
+    cancelled_runs = conclusions.count('cancelled')
+
+    # numpy is imported lazily to keep it off the cold-start path of early exits and 304 polls
+    import numpy as np
+
+    # Calculate durations in minutes; NaT propagates to NaN and is dropped with non-positive values
+    created = _to_datetime64([run.get('created_at') for run in workflow_runs])
+    updated = _to_datetime64([run.get('updated_at') for run in workflow_runs])
+    durations = (updated - created) / np.timedelta64(60, 's')
+    durations = durations[durations > 0]  # Validate positive duration
+
+    avg_duration = float(durations.mean()) if durations.size else 0
+    max_duration = float(durations.max()) if durations.size else 0
+    min_duration = float(durations.min()) if durations.size else 0
+    long_running = int(np.count_nonzero(durations > DURATION_THRESHOLD_MINUTES))
 
     # Performance trends
-    recent_runs = workflow_runs[:10]  # Last 10 runs
-    recent_success_rate = (
-        sum(1 for run in recent_runs if run.get('conclusion') == 'success') / len(recent_runs)
-        if recent_runs else 0
-    )
+    recent_success_rate = conclusions[:10].count('success') / min(total_runs, 10)  # Last 10 runs
 
     success_rate = successful_runs / total_runs if total_runs > 0 else 0
     failure_rate = failed_runs / total_runs if total_runs > 0 else 0
@@ -261,7 +502,7 @@ def calculate_pipeline_metrics(workflow_runs: List[Dict]) -> Dict[str, Any]:
         'avg_duration_minutes': avg_duration,
         'max_duration_minutes': max_duration,
         'min_duration_minutes': min_duration,
-        'long_running_pipelines': sum(1 for d in durations if d > DURATION_THRESHOLD_MINUTES)
+        'long_running_pipelines': long_running
     }
 
 
@@ -274,59 +515,17 @@ def publish_cloudwatch_metrics(metrics: Dict[str, Any], timestamp: datetime):
     try:
         metric_data = [
             {
-                'MetricName': 'PipelineSuccessRate',
-                'Value': metrics.get('success_rate', 0) * 100,
-                'Unit': 'Percent',
-                'Timestamp': timestamp,
-                'Dimensions': [
-                    {'Name': 'Repository', 'Value': f"{GITHUB_OWNER}/{GITHUB_REPO}"},
-                    {'Name': 'Environment', 'Value': os.getenv('ENVIRONMENT', 'unknown')}
-                ]
-            },
-            {
-                'MetricName': 'PipelineFailureRate',
-                'Value': metrics.get('failure_rate', 0) * 100,
-                'Unit': 'Percent',
-                'Timestamp': timestamp,
-                'Dimensions': [
-                    {'Name': 'Repository', 'Value': f"{GITHUB_OWNER}/{GITHUB_REPO}"},
-                    {'Name': 'Environment', 'Value': os.getenv('ENVIRONMENT', 'unknown')}
-                ]
-            },
-            {
-                'MetricName': 'AveragePipelineDuration',
-                'Value': metrics.get('avg_duration_minutes', 0),
-                'Unit': 'None',
-                'Timestamp': timestamp,
-                'Dimensions': [
-                    {'Name': 'Repository', 'Value': f"{GITHUB_OWNER}/{GITHUB_REPO}"},
-                    {'Name': 'Environment', 'Value': os.getenv('ENVIRONMENT', 'unknown')}
-                ]
-            },
-            {
-                'MetricName': 'TotalPipelineRuns',
-                'Value': metrics.get('total_runs', 0),
-                'Unit': 'Count',
-                'Timestamp': timestamp,
-                'Dimensions': [
-                    {'Name': 'Repository', 'Value': f"{GITHUB_OWNER}/{GITHUB_REPO}"},
-                    {'Name': 'Environment', 'Value': os.getenv('ENVIRONMENT', 'unknown')}
-                ]
-            },
-            {
-                'MetricName': 'LongRunningPipelines',
-                'Value': metrics.get('long_running_pipelines', 0),
-                'Unit': 'Count',
+                'MetricName': metric_name,
+                'Value': metrics.get(key, 0) * scale,
+                'Unit': unit,
                 'Timestamp': timestamp,
-                'Dimensions': [
-                    {'Name': 'Repository', 'Value': f"{GITHUB_OWNER}/{GITHUB_REPO}"},
-                    {'Name': 'Environment', 'Value': os.getenv('ENVIRONMENT', 'unknown')}
-                ]
+                'Dimensions': METRIC_DIMENSIONS
             }
+            for metric_name, key, unit, scale in METRIC_SPEC
         ]
 
         # Batch publish metrics
-        cloudwatch.put_metric_data(
+        get_client('cloudwatch').put_metric_data(
             Namespace='CI-CD/Pipeline',
             MetricData=metric_data
         )
@@ -344,14 +543,15 @@ def store_pipeline_metadata(metrics: Dict[str, Any], timestamp: datetime):
         table = dynamodb.Table(DYNAMODB_TABLE)
 
         item = {
-            'pipeline_id': f"{GITHUB_OWNER}/{GITHUB_REPO}",
+            'pipeline_id': REPOSITORY,
             'execution_id': f"metrics-{int(timestamp.timestamp())}",
             'timestamp': timestamp.isoformat(),
-            'metrics': metrics,
-            'success_rate': metrics.get('success_rate', 0),
-            'failure_rate': metrics.get('failure_rate', 0),
-            'avg_duration': metrics.get('avg_duration_minutes', 0),
-            'total_runs': metrics.get('total_runs', 0),
+            # Single copy of the metrics; readers project fields such as metrics.success_rate
+            # DynamoDB rejects Python floats, so they are stored as Decimal
+            'metrics': {
+                name: Decimal(str(value)) if isinstance(value, float) else value
+                for name, value in metrics.items()
+            },
             'status': 'healthy' if metrics.get('success_rate', 0) >= SUCCESS_RATE_THRESHOLD else 'degraded',
             'ttl': int((timestamp + timedelta(days=90)).timestamp())  # Auto-expire after 90 days
         }
@@ -364,6 +564,51 @@ def store_pipeline_metadata(metrics: Dict[str, Any], timestamp: datetime):
         raise
 
 
+def load_poll_state() -> Dict[str, Any]:
+    """Load the last GitHub ETag with the run window and metrics calculated from that response"""
+    if _poll_state:
+        return dict(_poll_state)
+
+    try:
+        table = dynamodb.Table(DYNAMODB_TABLE)
+        response = table.get_item(
+            Key={'pipeline_id': REPOSITORY, 'execution_id': POLL_STATE_EXECUTION_ID}
+        )
+        item = response.get('Item')
+        if not item or not item.get('etag'):
+            return {}
+
+        _poll_state.update(
+            etag=item['etag'],
+            metrics=json.loads(item['metrics']),
+            runs=json.loads(item['runs']) if 'runs' in item else None
+        )
+        return dict(_poll_state)
+
+    except (ClientError, ValueError, KeyError) as e:
+        logger.warning(f"Failed to load GitHub poll state: {str(e)}")
+        return {}
+
+
+def save_poll_state(etag: str, runs: List[Dict], metrics: Dict[str, Any], timestamp: datetime):
+    """Store the GitHub ETag with its run window and metrics for the next poll"""
+    _poll_state.update(etag=etag, metrics=metrics, runs=runs)
+
+    try:
+        table = dynamodb.Table(DYNAMODB_TABLE)
+        table.put_item(Item={
+            'pipeline_id': REPOSITORY,
+            'execution_id': POLL_STATE_EXECUTION_ID,
+            'timestamp': timestamp.isoformat(),
+            'etag': etag,
+            'runs': json.dumps(runs, separators=(',', ':')),
+            'metrics': json.dumps(metrics, default=str)
+        })
+
+    except ClientError as e:
+        logger.warning(f"Failed to store GitHub poll state: {str(e)}")
+
+
 def check_and_alert(metrics: Dict[str, Any]):
     """Check metrics against thresholds and send alerts if needed"""
     alerts = []
@@ -401,56 +646,70 @@ def check_and_alert(metrics: Dict[str, Any]):
             'threshold': DURATION_THRESHOLD_MINUTES
         })
 
-    # Send alerts
+    # Group alerts by topic so each topic gets a single PublishBatch request
+    sent_at = datetime.now().isoformat()
+    alerts_by_topic: Dict[str, List[Dict[str, Any]]] = {}
     for alert in alerts:
-        try:
-            topic_arn = SNS_CRITICAL_TOPIC if alert['severity'] == 'CRITICAL' else SNS_WARNING_TOPIC
-
-            message = {
-                'alert_type': 'pipeline_health',
-                'severity': alert['severity'],
-                'timestamp': datetime.now().isoformat(),
-                'repository': f"{GITHUB_OWNER}/{GITHUB_REPO}",
-                'metric': alert['metric'],
-                'current_value': alert['value'],
-                'threshold': alert['threshold'],
-                'message': alert['message'],
-                'circuit_breaker_state': circuit_breaker_state['state']
-            }
-
-            sns.publish(
-                TopicArn=topic_arn,
-                Message=json.dumps(message, default=str),
-                Subject=f"CI/CD Alert: {alert['message']}"
-            )
+        topic_arn = SNS_CRITICAL_TOPIC if alert['severity'] == 'CRITICAL' else SNS_WARNING_TOPIC
+        alerts_by_topic.setdefault(topic_arn, []).append(alert)
 
-            logger.warning(f"Sent {alert['severity']} alert: {alert['message']}")
+    # Send alerts
+    for topic_arn, topic_alerts in alerts_by_topic.items():
+        entries = [
+            {
+                'Id': str(index),
+                'Subject': f"CI/CD Alert: {alert['message']}",
+                'Message': json.dumps({
+                    'alert_type': 'pipeline_health',
+                    'severity': alert['severity'],
+                    'timestamp': sent_at,
+                    'repository': REPOSITORY,
+                    'metric': alert['metric'],
+                    'current_value': alert['value'],
+                    'threshold': alert['threshold'],
+                    'message': alert['message'],
+                    'circuit_breaker_state': circuit_breaker_state.state
+                }, default=str)
+            }
+            for index, alert in enumerate(topic_alerts)
+        ]
 
+        try:
+            response = get_client('sns').publish_batch(TopicArn=topic_arn, PublishBatchRequestEntries=entries)
         except ClientError as e:
-            logger.error(f"Failed to send alert: {str(e)}")
+            logger.error(f"Failed to send alerts: {str(e)}")
+            continue
+
+        failures = {entry['Id']: entry.get('Message') or entry.get('Code') for entry in response.get('Failed', [])}
+        for index, alert in enumerate(topic_alerts):
+            if str(index) in failures:
+                logger.error(f"Failed to send alert '{alert['message']}': {failures[str(index)]}")
+            else:
+                logger.warning(f"Sent {alert['severity']} alert: {alert['message']}")
 
 
 def save_metrics_to_s3(metrics: Dict[str, Any], timestamp: datetime):
     """Save detailed metrics to S3 for historical analysis"""
     try:
-        key = f"pipeline-metrics/{timestamp.strftime('%Y/%m/%d')}/metrics-{int(timestamp.timestamp())}.json"
+        key = f"pipeline-metrics/{timestamp.strftime('%Y/%m/%d')}/metrics-{int(timestamp.timestamp())}.json.gz"
 
         data = {
             'timestamp': timestamp.isoformat(),
-            'repository': f"{GITHUB_OWNER}/{GITHUB_REPO}",
+            'repository': REPOSITORY,
             'metrics': metrics,
-            'circuit_breaker_state': circuit_breaker_state,
+            'circuit_breaker_state': circuit_breaker_state.snapshot(),
             'collection_metadata': {
                 'collector_version': '1.0.0',
-                'environment': os.getenv('ENVIRONMENT', 'unknown')
+                'environment': ENVIRONMENT
             }
         }
 
-        s3.put_object(
+        get_client('s3').put_object(
             Bucket=S3_BUCKET,
             Key=key,
-            Body=json.dumps(data, default=str),
+            Body=gzip.compress(json.dumps(data, separators=(',', ':'), default=str).encode('utf-8'), compresslevel=6),
             ContentType='application/json',
+            ContentEncoding='gzip',
             ServerSideEncryption='aws:kms'
         )
 
@@ -476,29 +735,49 @@ def handler(event, context):
 
         timestamp = datetime.now()
 
-        # Fetch workflow runs with circuit breaker protection
-        workflow_data = get_github_workflow_runs(github_token)
+        # Fetch workflow runs with circuit breaker protection, revalidating the last response;
+        # with a stored window only runs created since its oldest run are requested
+        poll_state = load_poll_state()
+        window = poll_state.get('runs')
+        created_since = None
+        window_created = [run['created_at'] for run in window or [] if run.get('created_at')]
+        if window_created:
+            since = datetime.fromisoformat(min(window_created).replace('Z', '+00:00'))
+            # Hour precision keeps the query stable between polls so ETags keep matching
+            created_since = since.strftime('%Y-%m-%dT%H:00:00Z')
+        workflow_data = fetch_workflow_runs(github_token, etag=poll_state.get('etag'), created_since=created_since)
         if not workflow_data:
             logger.warning("No workflow data received, possibly due to circuit breaker")
             return {
                 'statusCode': 200,
                 'body': json.dumps({
                     'message': 'Metrics collection skipped due to circuit breaker',
-                    'circuit_breaker_state': circuit_breaker_state['state']
+                    'circuit_breaker_state': circuit_breaker_state.state
                 })
             }
 
-        workflow_runs = workflow_data.get('workflow_runs', [])
-        logger.info(f"Fetched {len(workflow_runs)} workflow runs")
+        if workflow_data.get('not_modified'):
+            logger.info("Workflow runs unchanged since last collection, reusing cached metrics")
+            metrics = poll_state['metrics']
+        else:
+            logger.info(f"Fetched {len(workflow_data['workflow_runs'])} workflow runs")
+            workflow_runs = merge_workflow_runs(
+                window if created_since else [], workflow_data['workflow_runs'], RUN_WINDOW_SIZE
+            )
+
+            # Calculate metrics
+            metrics = calculate_pipeline_metrics(workflow_runs)
+            logger.info(f"Calculated metrics: {json.dumps(metrics, default=str)}")
 
-        # Calculate metrics
-        metrics = calculate_pipeline_metrics(workflow_runs)
-        logger.info(f"Calculated metrics: {json.dumps(metrics, default=str)}")
+        # Store and publish metrics; the writes are independent so run them concurrently
+        writers = (publish_cloudwatch_metrics, store_pipeline_metadata, save_metrics_to_s3)
+        with ThreadPoolExecutor(max_workers=len(writers)) as executor:
+            futures = [executor.submit(writer, metrics, timestamp) for writer in writers]
+            for future in as_completed(futures):
+                future.result()
 
-        # Store and publish metrics with retry
-        retry_with_backoff(lambda: publish_cloudwatch_metrics(metrics, timestamp))
-        retry_with_backoff(lambda: store_pipeline_metadata(metrics, timestamp))
-        retry_with_backoff(lambda: save_metrics_to_s3(metrics, timestamp))
+        if workflow_data.get('etag') and workflow_data['etag'] != poll_state.get('etag'):
+            save_poll_state(workflow_data['etag'], workflow_runs, metrics, timestamp)
 
         # Check for alerts
         check_and_alert(metrics)
@@ -512,7 +791,7 @@ def handler(event, context):
                     'success_rate': f"{metrics.get('success_rate', 0):.2%}",
                     'avg_duration': f"{metrics.get('avg_duration_minutes', 0):.1f} minutes"
                 },
-                'circuit_breaker_state': circuit_breaker_state['state']
+                'circuit_breaker_state': circuit_breaker_state.state
             })
         }
 
@@ -541,7 +820,7 @@ def handler(event, context):
 
         # Send critical alert about collection failure
         try:
-            sns.publish(
+            get_client('sns').publish(
                 TopicArn=SNS_CRITICAL_TOPIC,
                 Message=json.dumps({
                     'alert_type': 'collector_failure',
@@ -4,27 +4,65 @@ Implements automated recovery procedures, circuit breakers, and failover strateg
 """
 
 import json
+import re
 import boto3
 import os
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from enum import Enum
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
 logger = logging.getLogger(__name__)
 
-# AWS clients
-dynamodb = boto3.resource('dynamodb')
-s3 = boto3.client('s3')
-sns = boto3.client('sns')
-lambda_client = boto3.client('lambda')
-cloudwatch = boto3.client('cloudwatch')
-secrets_manager = boto3.client('secretsmanager')
+# AWS clients; keep-alive sockets survive between warm invocations and adaptive
+# retries handle throttling during incident-time bursts
+BOTO_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=20,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    connect_timeout=3
+)
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+s3 = boto3.client('s3', config=BOTO_CONFIG)
+sns = boto3.client('sns', config=BOTO_CONFIG)
+secrets_manager = boto3.client('secretsmanager', config=BOTO_CONFIG)
+
+# Clients only some recovery plans need are created on first use, so cold starts for the
+# other failure types skip their setup
+CLIENT_CONFIGS = {
+    'lambda': BOTO_CONFIG
+}
+_clients = {}
+_clients_lock = threading.Lock()
+
+# GitHub session shared across warm invocations so the TLS connection is reused
+github_session = requests.Session()
+github_session.headers.update({
+    'Accept': 'application/vnd.github.v3+json',
+    'User-Agent': 'FreightlinerCI-RecoveryManager/1.0'
+})
+github_session.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=10,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,  # Recovery is latency sensitive; keep retries short
+        # 429 is left to the circuit breaker; urllib3 would honour any Retry-After uncapped
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=['GET'],
+        raise_on_status=False
+    )
+))
 
 # Configuration
 GITHUB_SECRET_ARN = os.getenv('GITHUB_SECRET_ARN')
@@ -36,6 +74,26 @@ SNS_CRITICAL_TOPIC = os.getenv('SNS_CRITICAL_TOPIC')
 CIRCUIT_BREAKER_ENABLED = os.getenv('CIRCUIT_BREAKER_ENABLED', 'true').lower() == 'true'
 CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_FAILURE_THRESHOLD', '5'))
 CIRCUIT_BREAKER_TIMEOUT = int(os.getenv('CIRCUIT_BREAKER_TIMEOUT', '60'))
+CIRCUIT_STATE_TTL = timedelta(days=30)  # Set on insert and on reset, so rows idle since then expire
+GITHUB_TOKEN_TTL = int(os.getenv('GITHUB_TOKEN_TTL', '3300'))  # Seconds a warm container reuses the token
+
+# Accepted event shapes
+SUPPORTED_EVENT_SOURCES = frozenset({'aws:sns', 'aws:events'})
+VALID_FAILURE_TYPES = frozenset({'pipeline_failure', 'performance_regression', 'resource_exhaustion',
+                                 'external_dependency_failure', 'build_failure', 'manual_recovery'})
+
+# Failure pattern matchers; GitHub reports timeouts as 'timed_out', and whole words keep
+# messages such as 'pipeline' from counting as pip changes
+TIMEOUT_PATTERN = re.compile(r'timed?_?out', re.IGNORECASE)
+DEPENDENCY_PATTERN = re.compile(r'\b(?:dependency|dependencies|packages?|npm|pip|yarn)\b', re.IGNORECASE)
+
+# GitHub token cached across warm invocations
+_token_cache = {'value': None, 'expires_at': 0.0}
+
+# Circuit states shared across warm invocations for a few seconds, so steady-state checks skip
+# DynamoDB; writes from this container replace the entry immediately
+CIRCUIT_STATE_CACHE_SECONDS = 10.0
+_circuit_state_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
 
 
 class ConfigurationError(Exception):
@@ -63,6 +121,15 @@ class RecoveryAction(Enum):
     BYPASS_FAILING_STEP = "bypass_failing_step"
 
 
+def get_client(service_name: str):
+    """Return the shared boto3 client for a service, creating it on first use"""
+    # boto3 client creation is not thread-safe and functions are scaled concurrently
+    with _clients_lock:
+        if service_name not in _clients:
+            _clients[service_name] = boto3.client(service_name, config=CLIENT_CONFIGS[service_name])
+        return _clients[service_name]
+
+
 def validate_environment():
     """Validate required environment variables"""
     required_vars = {
@@ -81,7 +148,10 @@ def validate_environment():
 
 
 def get_github_token() -> str:
-    """Retrieve GitHub token from AWS Secrets Manager"""
+    """Retrieve GitHub token from AWS Secrets Manager, reusing it for GITHUB_TOKEN_TTL seconds"""
+    if _token_cache['value'] and time.monotonic() < _token_cache['expires_at']:
+        return _token_cache['value']
+
     try:
         response = secrets_manager.get_secret_value(SecretId=GITHUB_SECRET_ARN)
 
@@ -92,6 +162,8 @@ def get_github_token() -> str:
             if not token:
                 raise ConfigurationError("GitHub token not found in secret")
 
+            _token_cache['value'] = token
+            _token_cache['expires_at'] = time.monotonic() + GITHUB_TOKEN_TTL
             return token
         else:
             raise ConfigurationError("Secret does not contain string data")
@@ -102,6 +174,10 @@ def get_github_token() -> str:
             raise ConfigurationError(f"Secret not found: {GITHUB_SECRET_ARN}")
         elif error_code == 'AccessDeniedException':
             raise ConfigurationError(f"Access denied to secret: {GITHUB_SECRET_ARN}")
+        elif _token_cache['value']:
+            # Transient Secrets Manager failure; the expired token is most likely still valid
+            logger.warning(f"Error refreshing secret, reusing cached GitHub token: {str(e)}")
+            return _token_cache['value']
         else:
             raise ConfigurationError(f"Error retrieving secret: {str(e)}")
 
@@ -120,15 +196,15 @@ def validate_event_input(event: Dict[str, Any]) -> bool:
             if not isinstance(record, dict):
                 raise ValueError("Each record must be a dictionary")
 
-            if 'EventSource' in record and record['EventSource'] not in ['aws:sns', 'aws:events']:
-                raise ValueError(f"Unsupported event source: {record['EventSource']}")
+            source = record.get('EventSource')
+            if 'EventSource' in record and (not isinstance(source, str) or source not in SUPPORTED_EVENT_SOURCES):
+                raise ValueError(f"Unsupported event source: {source}")
 
     # Validate direct invocation
     elif 'failure_type' in event:
-        valid_types = ['pipeline_failure', 'performance_regression', 'resource_exhaustion',
-                      'external_dependency_failure', 'build_failure', 'manual_recovery']
-        if event['failure_type'] not in valid_types:
-            raise ValueError(f"Invalid failure type: {event['failure_type']}")
+        failure_type = event['failure_type']
+        if not isinstance(failure_type, str) or failure_type not in VALID_FAILURE_TYPES:
+            raise ValueError(f"Invalid failure type: {failure_type}")
 
     return True
 
@@ -139,59 +215,101 @@ class CircuitBreakerManager:
     def __init__(self):
         self.table = dynamodb.Table(os.getenv('DYNAMODB_TABLE_CIRCUIT_BREAKER', 'circuit-breaker-state'))
 
+    @staticmethod
+    def _cached_state(service_name: str) -> Optional[Dict[str, Any]]:
+        """Return the cached state for a service if it is still fresh"""
+        cached = _circuit_state_cache.get(service_name)
+        if cached and time.monotonic() - cached[1] < CIRCUIT_STATE_CACHE_SECONDS:
+            return cached[0]
+        return None
+
+    @staticmethod
+    def _cache_state(service_name: str, state: Dict[str, Any]):
+        """Remember a state read from or written to DynamoDB"""
+        _circuit_state_cache[service_name] = (state, time.monotonic())
+
     def get_circuit_state(self, service_name: str) -> Dict[str, Any]:
         """Get current circuit breaker state for a service"""
         if not service_name:
             raise ValueError("Service name cannot be empty")
 
+        cached = self._cached_state(service_name)
+        if cached is not None:
+            return cached
+
         try:
             response = self.table.get_item(Key={'service_name': service_name})
 
-            if 'Item' in response:
-                return response['Item']
-            else:
-                # Initialize new circuit breaker
-                return {
-                    'service_name': service_name,
-                    'state': CircuitBreakerState.CLOSED.value,
-                    'failure_count': 0,
-                    'last_failure': None,
-                    'last_success': datetime.now().isoformat(),
-                    'ttl': int((datetime.now() + timedelta(days=30)).timestamp())
-                }
+            # Initialize new circuit breaker when the service has no stored state yet
+            state = response.get('Item') or self._get_default_circuit_state(service_name)
+            self._cache_state(service_name, state)
+            return state
 
         except ClientError as e:
             logger.error(f"Error getting circuit state for {service_name}: {str(e)}")
             return self._get_default_circuit_state(service_name)
 
+    def get_circuit_states(self, service_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Load circuit breaker states for several services with a single BatchGetItem"""
+        pending = [name for name in dict.fromkeys(service_names) if self._cached_state(name) is None]
+
+        try:
+            found = set()
+            keys = [{'service_name': name} for name in pending]
+            # BatchGetItem may return part of the keys under load; ask again for the rest
+            while keys:
+                response = dynamodb.batch_get_item(RequestItems={self.table.name: {'Keys': keys}})
+                for item in response.get('Responses', {}).get(self.table.name, []):
+                    self._cache_state(item['service_name'], item)
+                    found.add(item['service_name'])
+                keys = response.get('UnprocessedKeys', {}).get(self.table.name, {}).get('Keys', [])
+
+            for name in pending:
+                if name not in found:
+                    self._cache_state(name, self._get_default_circuit_state(name))
+
+        except ClientError as e:
+            # Leave the remaining services to be read one at a time
+            logger.error(f"Error getting circuit states for {', '.join(pending)}: {str(e)}")
+
+        return {name: self.get_circuit_state(name) for name in service_names}
+
     def _get_default_circuit_state(self, service_name: str) -> Dict[str, Any]:
         """Get default circuit breaker state"""
+        now = datetime.now()
         return {
             'service_name': service_name,
             'state': CircuitBreakerState.CLOSED.value,
             'failure_count': 0,
             'last_failure': None,
-            'last_success': datetime.now().isoformat(),
-            'ttl': int((datetime.now() + timedelta(days=30)).timestamp())
+            'last_success': now.isoformat(),
+            'ttl': int((now + CIRCUIT_STATE_TTL).timestamp())
         }
 
     def record_success(self, service_name: str):
         """Record successful operation"""
         try:
-            current_state = self.get_circuit_state(service_name)
-
-            # Reset circuit breaker on success
-            updated_state = {
-                **current_state,
+            now = datetime.now()
+            updates = {
                 'state': CircuitBreakerState.CLOSED.value,
                 'failure_count': 0,
-                'last_success': datetime.now().isoformat(),
-                'ttl': int((datetime.now() + timedelta(days=30)).timestamp())
+                'last_success': now.isoformat(),
+                'ttl': int((now + CIRCUIT_STATE_TTL).timestamp())
             }
 
-            self.table.put_item(Item=updated_state)
+            # Reset circuit breaker on success in a single write
+            response = self.table.update_item(
+                Key={'service_name': service_name},
+                UpdateExpression='SET #state = :state, failure_count = :failure_count, '
+                                 'last_success = :last_success, #ttl = :ttl',
+                ExpressionAttributeNames={'#state': 'state', '#ttl': 'ttl'},
+                ExpressionAttributeValues={f':{name}': value for name, value in updates.items()},
+                ReturnValues='ALL_OLD'
+            )
+            previous_state = response.get('Attributes', {})
+            self._cache_state(service_name, {**previous_state, 'service_name': service_name, **updates})
 
-            if current_state['state'] != CircuitBreakerState.CLOSED.value:
+            if previous_state.get('state', CircuitBreakerState.CLOSED.value) != CircuitBreakerState.CLOSED.value:
                 logger.info(f"Circuit breaker for {service_name} reset to CLOSED after success")
 
         except ClientError as e:
@@ -200,26 +318,46 @@ class CircuitBreakerManager:
     def record_failure(self, service_name: str) -> CircuitBreakerState:
         """Record failed operation and update circuit state"""
         try:
-            current_state = self.get_circuit_state(service_name)
-            failure_count = current_state.get('failure_count', 0) + 1
+            now = datetime.now()
+            # Atomic increment, so concurrent recoveries cannot lose each other's failures
+            response = self.table.update_item(
+                Key={'service_name': service_name},
+                UpdateExpression='ADD failure_count :one '
+                                 'SET last_failure = :now, #ttl = if_not_exists(#ttl, :ttl), '
+                                 '#state = if_not_exists(#state, :closed)',
+                ExpressionAttributeNames={'#state': 'state', '#ttl': 'ttl'},
+                ExpressionAttributeValues={
+                    ':one': 1,
+                    ':now': now.isoformat(),
+                    ':ttl': int((now + CIRCUIT_STATE_TTL).timestamp()),
+                    ':closed': CircuitBreakerState.CLOSED.value
+                },
+                ReturnValues='ALL_NEW'
+            )
+            updated_state = response['Attributes']
+            failure_count = updated_state['failure_count']
 
             new_state = CircuitBreakerState.CLOSED
             if failure_count >= CIRCUIT_BREAKER_FAILURE_THRESHOLD:
                 new_state = CircuitBreakerState.OPEN
 
-            updated_state = {
-                **current_state,
-                'state': new_state.value,
-                'failure_count': failure_count,
-                'last_failure': datetime.now().isoformat(),
-                'ttl': int((datetime.now() + timedelta(days=30)).timestamp())
-            }
-
-            self.table.put_item(Item=updated_state)
-
-            if new_state == CircuitBreakerState.OPEN:
-                logger.warning(f"Circuit breaker for {service_name} opened after {failure_count} failures")
+            if new_state == CircuitBreakerState.OPEN and updated_state['state'] != new_state.value:
+                try:
+                    self.table.update_item(
+                        Key={'service_name': service_name},
+                        UpdateExpression='SET #state = :open',
+                        ConditionExpression='#state <> :open',
+                        ExpressionAttributeNames={'#state': 'state'},
+                        ExpressionAttributeValues={':open': new_state.value}
+                    )
+                    logger.warning(f"Circuit breaker for {service_name} opened after {failure_count} failures")
+                except ClientError as e:
+                    # Another execution opened it first
+                    if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                        raise
+                updated_state = {**updated_state, 'state': new_state.value}
 
+            self._cache_state(service_name, updated_state)
             return new_state
 
         except ClientError as e:
@@ -256,14 +394,15 @@ class CircuitBreakerManager:
     def _transition_to_half_open(self, service_name: str):
         """Transition circuit breaker to half-open state"""
         try:
-            current_state = self.get_circuit_state(service_name)
-            updated_state = {
-                **current_state,
-                'state': CircuitBreakerState.HALF_OPEN.value,
-                'ttl': int((datetime.now() + timedelta(days=30)).timestamp())
-            }
-
-            self.table.put_item(Item=updated_state)
+            # Only the state changes, so update it in place instead of rewriting the item
+            response = self.table.update_item(
+                Key={'service_name': service_name},
+                UpdateExpression='SET #state = :state',
+                ExpressionAttributeNames={'#state': 'state'},
+                ExpressionAttributeValues={':state': CircuitBreakerState.HALF_OPEN.value},
+                ReturnValues='ALL_NEW'
+            )
+            self._cache_state(service_name, response['Attributes'])
             logger.info(f"Circuit breaker for {service_name} transitioned to HALF_OPEN")
 
         except ClientError as e:
@@ -275,12 +414,8 @@ class RecoveryExecutor:
 
     def __init__(self, github_token: str):
         self.github_token = github_token
-        self.github_session = requests.Session()
-        self.github_session.headers.update({
-            'Authorization': f'token {github_token}',
-            'Accept': 'application/vnd.github.v3+json',
-            'User-Agent': 'FreightlinerCI-RecoveryManager/1.0'
-        })
+        self.github_session = github_session
+        self.github_session.headers['Authorization'] = f'token {github_token}'
         self.circuit_manager = CircuitBreakerManager()
 
     def execute_recovery_plan(self, failure_type: str, context: Dict[str, Any]) -> List[str]:
@@ -301,9 +436,7 @@ class RecoveryExecutor:
             else:
                 recovery_actions.append(f"Unknown failure type: {failure_type}")
 
-            # Log recovery actions
             logger.info(f"Executed {len(recovery_actions)} recovery actions for {failure_type}")
-            self._log_recovery_actions(failure_type, recovery_actions, context)
 
             return recovery_actions
 
@@ -366,11 +499,9 @@ class RecoveryExecutor:
         if 'lambda_throttling' in context:
             actions.append("Increasing Lambda provisioned concurrency")
 
-        # Clear S3 cache if storage is full
+        # Old monitoring data is expired by the bucket lifecycle rule rather than listed and deleted here
         if 'storage_full' in context:
-            actions.append("Cleaning up old monitoring data from S3")
-            cleaned_objects = self._cleanup_old_s3_data()
-            actions.extend(cleaned_objects)
+            actions.append("S3 expiration handled by lifecycle policy")
 
         # Scale DynamoDB capacity if needed
         if 'dynamodb_throttling' in context:
@@ -385,10 +516,20 @@ class RecoveryExecutor:
         # Activate circuit breakers for failing services
         failing_services = context.get('failing_services', ['github'])
 
+        self.circuit_manager.get_circuit_states(failing_services)
+        allowed_services = [service for service in failing_services
+                            if self.circuit_manager.should_allow_request(service)]
+
+        # Test service availability concurrently; the probes are independent network calls
+        availability = {}
+        if allowed_services:
+            with ThreadPoolExecutor(max_workers=len(allowed_services)) as executor:
+                availability = dict(zip(allowed_services,
+                                        executor.map(self._test_service_availability, allowed_services)))
+
         for service in failing_services:
-            if self.circuit_manager.should_allow_request(service):
-                # Test service availability
-                if self._test_service_availability(service):
+            if service in availability:
+                if availability[service]:
                     self.circuit_manager.record_success(service)
                     actions.append(f"Service {service} recovered, circuit breaker reset")
                 else:
@@ -419,10 +560,13 @@ class RecoveryExecutor:
         """Get recent workflow failures for pattern analysis"""
         try:
             url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/actions/runs"
+            created_since = (datetime.now() - timedelta(hours=hours_back)).strftime('%Y-%m-%dT%H:%M:%SZ')
             params = {
                 'status': 'failure',
                 'per_page': 20,
-                'created': f'>{(datetime.now() - timedelta(hours=hours_back)).isoformat()}'
+                'created': f'>{created_since}',
+                # Only the conclusion and head commit are analyzed; the pull request list is the bulk of each run
+                'exclude_pull_requests': 'true'
             }
 
             if not self.circuit_manager.should_allow_request('github'):
@@ -436,6 +580,9 @@ class RecoveryExecutor:
                 data = response.json()
                 return data.get('workflow_runs', [])
             else:
+                if response.status_code == 401:
+                    # Drop the cached token so the next invocation picks up a rotated secret
+                    _token_cache['value'] = None
                 self.circuit_manager.record_failure('github')
                 logger.error(f"GitHub API returned status {response.status_code}")
                 return []
@@ -455,12 +602,12 @@ class RecoveryExecutor:
 
         for failure in failures:
             # Analyze conclusion for timeouts
-            if failure.get('conclusion') and 'timeout' in failure.get('conclusion', '').lower():
+            if TIMEOUT_PATTERN.search(failure.get('conclusion') or ''):
                 timeout_count += 1
 
             # Analyze commit message for dependency issues
-            commit_msg = failure.get('head_commit', {}).get('message', '').lower()
-            if any(word in commit_msg for word in ['dependency', 'package', 'npm', 'pip', 'yarn']):
+            commit_msg = (failure.get('head_commit') or {}).get('message') or ''
+            if DEPENDENCY_PATTERN.search(commit_msg):
                 dependency_count += 1
 
         if timeout_count >= 2:
@@ -511,25 +658,12 @@ class RecoveryExecutor:
         try:
             # Get CI/CD related Lambda functions
             functions = ['pipeline-metrics-collector', 'performance-monitor']
+            func_names = [f"{GITHUB_OWNER}-{GITHUB_REPO}-{func_suffix}" for func_suffix in functions]
 
-            for func_suffix in functions:
-                func_name = f"{GITHUB_OWNER}-{GITHUB_REPO}-{func_suffix}"
-
-                try:
-                    config = lambda_client.get_function_configuration(FunctionName=func_name)
-                    current_memory = config['MemorySize']
-                    new_memory = min(3008, int(current_memory * scale_factor))  # Max Lambda memory
-
-                    if new_memory != current_memory:
-                        lambda_client.update_function_configuration(
-                            FunctionName=func_name,
-                            MemorySize=new_memory
-                        )
-                        actions.append(f"Scaled {func_name} memory from {current_memory}MB to {new_memory}MB")
-
-                except ClientError as e:
-                    if e.response['Error']['Code'] != 'ResourceNotFoundException':
-                        logger.error(f"Error scaling function {func_name}: {str(e)}")
+            # Each function is read and updated independently, so scale them concurrently
+            with ThreadPoolExecutor(max_workers=len(func_names)) as executor:
+                results = executor.map(lambda func_name: self._scale_lambda_function(func_name, scale_factor), func_names)
+                actions.extend(action for action in results if action)
 
         except Exception as e:
             logger.error(f"Error in Lambda scaling: {str(e)}")
@@ -537,51 +671,31 @@ class RecoveryExecutor:
 
         return actions
 
-    def _cleanup_old_s3_data(self, days_old: int = 30) -> List[str]:
-        """Clean up old monitoring data from S3"""
-        actions = []
-
+    def _scale_lambda_function(self, func_name: str, scale_factor: float) -> Optional[str]:
+        """Scale a single Lambda function's memory, returning the action taken if any"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days_old)
-
-            paginator = s3.get_paginator('list_objects_v2')
-            page_iterator = paginator.paginate(Bucket=S3_BUCKET)
-
-            objects_to_delete = []
-
-            for page in page_iterator:
-                for obj in page.get('Contents', []):
-                    if obj['LastModified'].replace(tzinfo=None) < cutoff_date:
-                        objects_to_delete.append({'Key': obj['Key']})
-
-                    # Delete in batches of 1000
-                    if len(objects_to_delete) >= 1000:
-                        s3.delete_objects(
-                            Bucket=S3_BUCKET,
-                            Delete={'Objects': objects_to_delete}
-                        )
-                        actions.append(f"Deleted batch of {len(objects_to_delete)} old objects")
-                        objects_to_delete = []
-
-            # Delete remaining objects
-            if objects_to_delete:
-                s3.delete_objects(
-                    Bucket=S3_BUCKET,
-                    Delete={'Objects': objects_to_delete}
+            config = get_client('lambda').get_function_configuration(FunctionName=func_name)
+            current_memory = config['MemorySize']
+            new_memory = min(3008, int(current_memory * scale_factor))  # Max Lambda memory
+
+            if new_memory != current_memory:
+                get_client('lambda').update_function_configuration(
+                    FunctionName=func_name,
+                    MemorySize=new_memory
                 )
-                actions.append(f"Deleted final batch of {len(objects_to_delete)} old objects")
+                return f"Scaled {func_name} memory from {current_memory}MB to {new_memory}MB"
 
         except ClientError as e:
-            logger.error(f"Error cleaning up S3 data: {str(e)}")
-            actions.append(f"S3 cleanup failed: {str(e)}")
+            if e.response['Error']['Code'] != 'ResourceNotFoundException':
+                logger.error(f"Error scaling function {func_name}: {str(e)}")
 
-        return actions
+        return None
 
     def _test_service_availability(self, service: str) -> bool:
         """Test if external service is available"""
         try:
             if service == 'github':
-                response = requests.get('https://api.github.com/rate_limit', timeout=10)
+                response = github_session.get('https://api.github.com/rate_limit', timeout=10)
                 return response.status_code == 200
 
             # Add other service tests as needed
@@ -591,7 +705,7 @@ class RecoveryExecutor:
             logger.error(f"Service availability test failed for {service}: {str(e)}")
             return False
 
-    def _log_recovery_actions(self, failure_type: str, actions: List[str], context: Dict[str, Any]):
+    def log_recovery_actions(self, failure_type: str, actions: List[str], context: Dict[str, Any], success: bool):
         """Log recovery actions to S3 for audit trail"""
         try:
             timestamp = datetime.now()
@@ -602,15 +716,16 @@ class RecoveryExecutor:
                 'failure_type': failure_type,
                 'context': context,
                 'recovery_actions': actions,
-                'success': True
+                'success': success
             }
 
+            # The bucket's default encryption applies the module KMS key with an S3 Bucket Key,
+            # so this write does not wait on a KMS data key request
             s3.put_object(
                 Bucket=S3_BUCKET,
                 Key=key,
                 Body=json.dumps(log_data, default=str),
-                ContentType='application/json',
-                ServerSideEncryption='aws:kms'
+                ContentType='application/json'
             )
 
         except Exception as e:
@@ -692,8 +807,10 @@ def handler(event, context):
         # Determine if recovery was successful
         success = len(recovery_actions) > 0 and not any('failed' in action.lower() for action in recovery_actions)
 
-        # Send notification
-        send_recovery_notification(failure_type, recovery_actions, success)
+        # Write the audit log and send the notification concurrently
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            pool.submit(executor.log_recovery_actions, failure_type, recovery_actions, failure_context, success)
+            pool.submit(send_recovery_notification, failure_type, recovery_actions, success)
 
         return {
             'statusCode': 200,
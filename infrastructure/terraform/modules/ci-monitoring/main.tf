@@ -141,6 +141,9 @@ resource "aws_s3_bucket_lifecycle_configuration" "monitoring_data" {
     id     = "monitoring_data_lifecycle"
     status = "Enabled"
 
+    # Applies to the whole bucket; expiry runs server-side instead of in the recovery Lambda
+    filter {}
+
     transition {
       days          = 30
       storage_class = "STANDARD_IA"